@@ -13,7 +13,6 @@ from rest_framework import (
     status,
 )
 
-from rest_framework_simplejwt.authentication import JWTAuthentication
 
 from apps.about_us.models import AboutUs
 from apps.about_us.serializers import AboutUsSerializer
@@ -21,7 +20,6 @@ from cafe.custom_permissions import  HasPermissionOrInGroupWithPermission
 
 class AboutUsCreateView(generics.CreateAPIView):
     serializer_class = AboutUsSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename='about_us.add_aboutus'
     def perform_create(self, serializer):
@@ -69,7 +67,6 @@ class AboutUsRetrieveView(generics.RetrieveAPIView):
 
 class AboutUsUpdateView(generics.UpdateAPIView):
     serializer_class = AboutUsSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename='about_us.change_aboutus'
     lookup_field = "id"
@@ -95,7 +92,6 @@ class AboutUsUpdateView(generics.UpdateAPIView):
 
 
 class AboutUsDeleteView(generics.DestroyAPIView):
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename='about_us.delete_aboutus'
 
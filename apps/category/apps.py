@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class CategoryConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.category'
+
+    def ready(self):
+        from apps.category.models import rebuild_category_closure
+
+        post_migrate.connect(rebuild_category_closure, sender=self)
@@ -1,7 +1,7 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from django.dispatch import receiver
-from django.db.models.signals import pre_save
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.core.files.base import ContentFile
 
 import uuid
@@ -57,8 +57,26 @@ class Category(models.Model):
         upload_to=category_image_file_path,
     )
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored parent so save() can tell when the node moved
+        instance._loaded_parent_id = instance.__dict__.get("parent_id")
+        return instance
+
     def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
+        is_new = self._state.adding
+        parent_changed = (
+            not is_new
+            and getattr(self, "_loaded_parent_id", self.parent_id) != self.parent_id
+        )
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if is_new:
+                CategoryClosure.objects.insert_node(self)
+            elif parent_changed:
+                CategoryClosure.objects.move_subtree(self)
+        self._loaded_parent_id = self.parent_id
         if self.image:
             image_size = self.image.size  # Size in bytes
             max_size_bytes = 500 * 500  # .5 MB
@@ -96,6 +114,128 @@ class Category(models.Model):
                     save=True,
                 )
 
+    def get_ancestors(self, include_self=False):
+        """All ancestors of this category, root first, in a single query."""
+        ancestors = Category.objects.filter(descendant_links__descendant=self)
+        if not include_self:
+            ancestors = ancestors.exclude(pk=self.pk)
+        return ancestors.order_by("-descendant_links__depth")
+
+    def get_descendants(self, include_self=False):
+        """The whole subtree below this category in a single query."""
+        descendants = Category.objects.filter(ancestor_links__ancestor=self)
+        if not include_self:
+            descendants = descendants.exclude(pk=self.pk)
+        return descendants
+
+    def get_root(self):
+        return (
+            Category.objects.filter(
+                descendant_links__descendant=self, parent__isnull=True
+            ).first()
+            or self
+        )
+
+
+class CategoryClosureManager(models.Manager):
+    def insert_node(self, category):
+        """Link a new category to itself and to every ancestor of its parent."""
+        links = [self.model(ancestor=category, descendant=category, depth=0)]
+        if category.parent_id:
+            links += [
+                self.model(
+                    ancestor_id=ancestor_id, descendant=category, depth=depth + 1
+                )
+                for ancestor_id, depth in self.filter(
+                    descendant_id=category.parent_id
+                ).values_list("ancestor_id", "depth")
+            ]
+        self.bulk_create(links)
+
+    def move_subtree(self, category):
+        """Re-attach the subtree rooted at ``category`` under its new parent."""
+        subtree = list(
+            self.filter(ancestor=category).values_list("descendant_id", "depth")
+        )
+        subtree_ids = [descendant_id for descendant_id, _ in subtree]
+        # Drop the links from the old ancestors into the subtree
+        self.filter(descendant_id__in=subtree_ids).exclude(
+            ancestor_id__in=subtree_ids
+        ).delete()
+        if not category.parent_id:
+            return
+        new_ancestors = self.filter(descendant_id=category.parent_id).values_list(
+            "ancestor_id", "depth"
+        )
+        self.bulk_create(
+            [
+                self.model(
+                    ancestor_id=ancestor_id,
+                    descendant_id=descendant_id,
+                    depth=ancestor_depth + descendant_depth + 1,
+                )
+                for ancestor_id, ancestor_depth in new_ancestors
+                for descendant_id, descendant_depth in subtree
+            ]
+        )
+
+    def rebuild(self):
+        """Recompute the whole closure from ``Category.parent``."""
+        parents = dict(Category.objects.values_list("id", "parent_id"))
+        links = []
+        for category_id in parents:
+            ancestor_id, depth = category_id, 0
+            seen = set()
+            while ancestor_id and ancestor_id not in seen:
+                seen.add(ancestor_id)
+                links.append(
+                    self.model(
+                        ancestor_id=ancestor_id, descendant_id=category_id, depth=depth
+                    )
+                )
+                ancestor_id, depth = parents.get(ancestor_id), depth + 1
+        with transaction.atomic():
+            self.all().delete()
+            self.bulk_create(links, batch_size=500)
+
+    def lineage_ids(self, category_ids):
+        """Ids of the given categories plus all their ancestors and descendants."""
+        return set(
+            self.filter(descendant_id__in=category_ids).values_list(
+                "ancestor_id", flat=True
+            )
+        ) | set(
+            self.filter(ancestor_id__in=category_ids).values_list(
+                "descendant_id", flat=True
+            )
+        )
+
+
+class CategoryClosure(models.Model):
+    """
+    Closure table of the category tree: one row per (ancestor, descendant) pair,
+    including a depth 0 row linking every category to itself. Rows are maintained
+    by ``Category.save`` and removed with the category through the cascade.
+    """
+
+    ancestor = models.ForeignKey(
+        Category, on_delete=models.CASCADE, related_name="descendant_links"
+    )
+    descendant = models.ForeignKey(
+        Category, on_delete=models.CASCADE, related_name="ancestor_links"
+    )
+    depth = models.PositiveIntegerField(default=0)
+
+    objects = CategoryClosureManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["ancestor", "descendant"], name="unique_category_closure"
+            )
+        ]
+        indexes = [models.Index(fields=["descendant", "depth"])]
+
 
 class CategoryImages(models.Model):
     category = models.ForeignKey(
@@ -120,3 +260,16 @@ def pre_save_receiver(sender, instance, *args, **kwargs):
                 instance.slug = unique_slug_generator(instance)
         except sender.DoesNotExist:
             return "can not make a slug for category "
+
+
+@receiver([post_save, post_delete], sender=Category)
+def category_tree_invalidation_receiver(sender, instance, *args, **kwargs):
+    from apps.category.tree import invalidate_category_tree
+
+    invalidate_category_tree()
+
+
+def rebuild_category_closure(sender, **kwargs):
+    """Fill the closure table for categories created before it existed."""
+    if Category.objects.exists() and not CategoryClosure.objects.exists():
+        CategoryClosure.objects.rebuild()
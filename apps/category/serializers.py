@@ -1,4 +1,5 @@
 from apps.category.models import Category, CategoryImages
+from apps.category.tree import get_category_children
 
 from django.conf import settings
 from django.utils.translation import gettext_lazy as _
@@ -88,6 +89,19 @@ class CategorySerializer(serializers.ModelSerializer):
     def get_updated_at(self, obj):
         return obj.updated_at.strftime("%Y-%m-%d")
 
+    def validate_parent(self, parent):
+        if (
+            parent
+            and self.instance
+            and self.instance.get_descendants(include_self=True)
+            .filter(pk=parent.pk)
+            .exists()
+        ):
+            raise ValidationError(
+                _("A category can not be moved under itself or its subcategories")
+            )
+        return parent
+
     def get_parent_name(self, obj):
         return obj.parent.name if obj.parent else "NA"
 
@@ -145,9 +159,8 @@ class NestedCategorySerializer(serializers.ModelSerializer):
         fields = ["id", "name", "name_ar", "slug", "image", "children"]
 
     def get_children(self, obj):
-        children = Category.objects.filter(parent=obj).order_by("-created_at")
-        serializer = NestedCategorySerializer(children, many=True, context=self.context)
-        return serializer.data
+        # Children come from the cached category tree, not one query per node
+        return get_category_children(obj.id, self.context.get("request"))
     def get_image_url(self, obj):
         request = self.context.get('request')
         if obj.image and request:
@@ -0,0 +1,95 @@
+import uuid
+
+from django.core.cache import cache
+from django.utils import translation
+
+from apps.category.models import Category
+
+
+CATEGORY_TREE_VERSION_KEY = "category_tree:version"
+CATEGORY_TREE_CACHE_KEY = "category_tree:{version}:{language}:{host}"
+CATEGORY_TREE_TIMEOUT = 60 * 60 * 24
+
+
+def _tree_version():
+    version = cache.get(CATEGORY_TREE_VERSION_KEY)
+    if version is None:
+        version = 1
+        cache.add(CATEGORY_TREE_VERSION_KEY, version, None)
+    return version
+
+
+def invalidate_category_tree():
+    """Drop every cached tree; called whenever a category is written."""
+    try:
+        cache.incr(CATEGORY_TREE_VERSION_KEY)
+    except ValueError:
+        cache.set(CATEGORY_TREE_VERSION_KEY, 2, None)
+
+
+def build_category_tree(request=None):
+    """
+    Load all categories with one query and assemble the nested tree in memory.
+    Nodes have the same shape as ``NestedCategorySerializer`` output.
+    """
+    storage = Category._meta.get_field("image").storage
+    categories = Category.objects.order_by("-created_at").values(
+        "id", "name", "name_ar", "slug", "image", "parent_id", "is_deleted"
+    )
+
+    nodes = {}
+    for category in categories:
+        image_url = None
+        if category["image"]:
+            image_url = storage.url(category["image"])
+            if request:
+                image_url = request.build_absolute_uri(image_url)
+        nodes[category["id"]] = {
+            "id": str(category["id"]),
+            "name": category["name"],
+            "name_ar": category["name_ar"],
+            "slug": category["slug"],
+            "image": image_url,
+            "children": [],
+        }
+
+    roots = []
+    for category in categories:
+        node = nodes[category["id"]]
+        parent = nodes.get(category["parent_id"])
+        if parent is not None:
+            parent["children"].append(node)
+        elif category["parent_id"] is None and not category["is_deleted"]:
+            roots.append(node)
+
+    return {
+        "roots": roots,
+        "nodes": {node["id"]: node for node in nodes.values()},
+    }
+
+
+def get_category_tree(request=None):
+    """Return the cached category tree for the active language, building it once."""
+    key = CATEGORY_TREE_CACHE_KEY.format(
+        version=_tree_version(),
+        language=translation.get_language(),
+        host=request.get_host() if request else "",
+    )
+    tree = cache.get(key)
+    if tree is None:
+        tree = build_category_tree(request)
+        cache.set(key, tree, CATEGORY_TREE_TIMEOUT)
+    return tree
+
+
+def get_root_categories(request=None):
+    return get_category_tree(request)["roots"]
+
+
+def get_category_children(category_id, request=None):
+    try:
+        category_id = str(uuid.UUID(str(category_id)))
+    except ValueError:
+        return []
+    node = get_category_tree(request)["nodes"].get(category_id)
+    return node["children"] if node else []
@@ -11,7 +11,6 @@ from rest_framework import (
     generics,
     status,
 )
-from rest_framework_simplejwt.authentication import JWTAuthentication
 
 from apps.category.models import Category, CategoryImages
 from apps.category.serializers import (
@@ -24,6 +23,7 @@ from apps.category.serializers import (
     CategoryImageSerializer,
 )
 from apps.category.filters import CategoryFilter
+from apps.category.tree import get_category_children, get_root_categories
 
 from cafe.pagination import StandardResultsSetPagination
 from cafe.custom_permissions import HasPermissionOrInGroupWithPermission
@@ -32,7 +32,6 @@ from cafe.custom_permissions import HasPermissionOrInGroupWithPermission
 # category Views
 class CategoryCreateView(generics.CreateAPIView):
     serializer_class = CategorySerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "category.add_category"
 
@@ -76,7 +75,6 @@ class CategoryCreateView(generics.CreateAPIView):
 class CategoryListView(generics.ListAPIView):
     queryset = Category.objects.filter(is_deleted=False).order_by("-created_at")
     serializer_class = CategorySerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "category.view_category"
     pagination_class = StandardResultsSetPagination
@@ -96,7 +94,6 @@ class CategoryListView(generics.ListAPIView):
 class DeletedCategoryListView(generics.ListAPIView):
     queryset = Category.objects.filter(is_deleted=True).order_by("-created_at")
     serializer_class = CategorySerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "category.view_category"
     pagination_class = StandardResultsSetPagination
@@ -117,7 +114,6 @@ class CategoryRetrieveView(generics.RetrieveAPIView):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     lookup_field = "id"  # Use 'id' as the lookup field
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "category.view_category"
 
@@ -129,7 +125,6 @@ class CategoryRetrieveView(generics.RetrieveAPIView):
 
 class ChildrenCategoriesView(generics.ListAPIView):
     serializer_class = NestedCategorySerializer  # Use your Category serializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "category.view_category"
     pagination_class = StandardResultsSetPagination
@@ -137,21 +132,10 @@ class ChildrenCategoriesView(generics.ListAPIView):
     ordering_fields = ["created_at", "name", "id"]  # Allow ordering on these fields
     ordering = ["-created_at"]  # Default ordering (descending)
 
-    def get_queryset(self):
-        category_id = self.request.query_params.get("category_id")
-        parent_category = Category.objects.filter(id=category_id).first()
-
-        if parent_category:
-            return Category.objects.filter(parent=parent_category).order_by('-created_at')
-        else:
-            return Category.objects.none()
-
     def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
-        serializer = self.serializer_class(
-            queryset, many=True, context={"request": request}
-        )
-        return Response(serializer.data)
+        # Served from the cached in-memory tree instead of one query per node
+        category_id = request.query_params.get("category_id")
+        return Response(get_category_children(category_id, request))
 
 
 class ActiveCategoryListView(generics.ListAPIView):
@@ -159,7 +143,6 @@ class ActiveCategoryListView(generics.ListAPIView):
         "-created_at"
     )
     serializer_class = CategorySerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "category.view_category"
     pagination_class = StandardResultsSetPagination
@@ -178,7 +161,6 @@ class ActiveCategoryListView(generics.ListAPIView):
 
 class CategoryChangeActiveView(generics.UpdateAPIView):
     serializer_class = CategoryActiveSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "category.change_category"
 
@@ -211,7 +193,6 @@ class CategoryUpdateView(generics.UpdateAPIView):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     lookup_field = "category_id"
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "category.change_category"
 
@@ -237,7 +218,6 @@ class CategoryUpdateView(generics.UpdateAPIView):
 
 class CategoryImagesUpdateView(generics.UpdateAPIView):
     serializer_class = CategoryImageSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "category.change_category"
     queryset = CategoryImages.objects.all()
@@ -275,7 +255,6 @@ class CategoryImagesUpdateView(generics.UpdateAPIView):
 
 class CategoryImagesDeleteView(generics.DestroyAPIView):
     serializer_class = CategoryImageSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "category.delete_categoryimage"
     queryset = CategoryImages.objects.all()
@@ -293,7 +272,6 @@ class CategoryImagesDeleteView(generics.DestroyAPIView):
 
 class CategoryDeleteTemporaryView(generics.UpdateAPIView):
     serializer_class = CategoryDeleteSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "category.change_category"
 
@@ -340,7 +318,6 @@ class CategoryDeleteTemporaryView(generics.UpdateAPIView):
 class CategoryRestoreView(generics.RetrieveUpdateAPIView):
 
     serializer_class = CategoryDeleteSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "category.change_category"
 
@@ -379,7 +356,6 @@ class CategoryRestoreView(generics.RetrieveUpdateAPIView):
 
 
 class CategoryDeleteView(generics.DestroyAPIView):
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename='category.delete_category'
 
@@ -399,7 +375,6 @@ class CategoryDeleteView(generics.DestroyAPIView):
 class CategoryDialogView(generics.ListAPIView):
     queryset = Category.objects.filter(is_deleted=False)
     serializer_class = CategoryDialogSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
 
 
@@ -408,5 +383,7 @@ class ParentCategoryDialog(generics.ListAPIView):
         "-created_at"
     )
     serializer_class = NestedCategorySerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
+
+    def list(self, request, *args, **kwargs):
+        return Response(get_root_categories(request))
@@ -9,7 +9,6 @@ from rest_framework import (
     status,
 )
 
-from rest_framework_simplejwt.authentication import JWTAuthentication
 
 from apps.contact_us.models import ContactUs
 from .serializers import ContactUsSerializer, ContactUsReadSerializer
@@ -33,7 +32,6 @@ class ContactUSCreateView(generics.CreateAPIView):
 
 class ContactUsListView(generics.ListAPIView):
     serializer_class = ContactUsSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename='contact_us.view_contactus'
     queryset = ContactUs.objects.all().order_by("-created_at")
@@ -42,7 +40,6 @@ class ContactUsListView(generics.ListAPIView):
 
 class ContactUsRetrieveView(generics.RetrieveAPIView):
     serializer_class = ContactUsSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename='contact_us.view_contactus'
     lookup_field = "id"
@@ -55,7 +52,6 @@ class ContactUsRetrieveView(generics.RetrieveAPIView):
 
 class ContactUsChangeRead(generics.UpdateAPIView):
     serializer_class = ContactUsReadSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename='contact_us.change_contactus'
 
@@ -77,7 +73,6 @@ class ContactUsChangeRead(generics.UpdateAPIView):
 
 
 class ContactUsDeleteView(generics.DestroyAPIView):
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename='contact_us.delete_contactus'
 
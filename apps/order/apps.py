@@ -1,6 +1,16 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class OrderConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.order'
+
+    def ready(self):
+        from apps.order.models import (
+            backfill_order_item_snapshots,
+            backfill_table_current_orders,
+        )
+
+        post_migrate.connect(backfill_order_item_snapshots, sender=self)
+        post_migrate.connect(backfill_table_current_orders, sender=self)
@@ -0,0 +1,117 @@
+import time as monotonic_time
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import IntegrityError
+from django.db.models import Q
+from django.utils.timezone import make_aware
+
+from apps.order.models import BusinessDay
+
+
+OPEN_BUSINESS_DAY_CACHE_KEY = "business_day:open"
+NO_OPEN_BUSINESS_DAY = "none"
+
+# (expires, business_day) for this process
+_process_cache = {}
+
+
+def start_of_day(day):
+    return make_aware(datetime.combine(day, time.min))
+
+
+def invalidate_open_business_day():
+    """Forget the cached open day; called whenever a BusinessDay is written."""
+    _process_cache.clear()
+    cache.delete(OPEN_BUSINESS_DAY_CACHE_KEY)
+
+
+def _cached_open_business_day():
+    expires, business_day = _process_cache.get("open", (0, None))
+    if expires > monotonic_time.monotonic():
+        return business_day
+
+    business_day = cache.get(OPEN_BUSINESS_DAY_CACHE_KEY)
+    if business_day is None:
+        business_day = (
+            BusinessDay.objects.filter(end_time__isnull=True)
+            .order_by("-start_time")
+            .first()
+        ) or NO_OPEN_BUSINESS_DAY
+        cache.set(
+            OPEN_BUSINESS_DAY_CACHE_KEY,
+            business_day,
+            settings.BUSINESS_DAY_CACHE_TIMEOUT,
+        )
+
+    if business_day == NO_OPEN_BUSINESS_DAY:
+        business_day = None
+    _process_cache["open"] = (
+        monotonic_time.monotonic() + settings.BUSINESS_DAY_LOCAL_TIMEOUT,
+        business_day,
+    )
+    return business_day
+
+
+def _cache_is_shared():
+    return not isinstance(caches["default"], LocMemCache)
+
+
+def get_open_business_day(verify=False):
+    """
+    The open (not yet closed) business day, or ``None``.
+
+    The day is kept in the shared cache for ``BUSINESS_DAY_CACHE_TIMEOUT``
+    seconds, or until a BusinessDay is saved or deleted, and in the process
+    for ``BUSINESS_DAY_LOCAL_TIMEOUT`` seconds, so callers normally do not
+    query for it. Payment paths pass ``verify=True``: when the cache is the
+    per-process local-memory one, another worker closing the day never
+    clears this copy, so the day is then checked to still be open (one
+    primary key lookup) and looked up again if it is not.
+    """
+    business_day = _cached_open_business_day()
+    if (
+        verify
+        and not _cache_is_shared()
+        and not (
+            business_day
+            and BusinessDay.objects.filter(
+                pk=business_day.pk, end_time__isnull=True
+            ).exists()
+        )
+    ):
+        invalidate_open_business_day()
+        business_day = _cached_open_business_day()
+    return business_day
+
+
+def retry_with_fresh_business_day(record_payment):
+    """
+    Call ``record_payment``, which writes a payment against
+    ``get_open_business_day()``. If the write fails because the cached day
+    has been deleted in the meantime, forget the day and call it once more.
+    """
+    try:
+        return record_payment()
+    except IntegrityError:
+        invalidate_open_business_day()
+        return record_payment()
+
+
+def business_days_between(from_day, to_day):
+    """
+    Business days overlapping the dates ``from_day`` to ``to_day``
+    (inclusive), oldest first. Compares ``start_time``/``end_time`` with
+    datetime bounds instead of ``__date`` so the indexes can be used.
+    """
+    return BusinessDay.objects.filter(
+        Q(start_time__lt=start_of_day(to_day + timedelta(days=1)))
+        & (Q(end_time__gte=start_of_day(from_day)) | Q(end_time__isnull=True))
+    ).order_by("start_time")
+
+
+def business_day_for_date(day):
+    """The latest business day that covers ``day``, or ``None``."""
+    return business_days_between(day, day).order_by("-start_time").first()
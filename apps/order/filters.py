@@ -1,31 +1,79 @@
+import calendar
+from datetime import date, timedelta
+
 import django_filters
 from django_filters import FilterSet
 
+from apps.order.business_day import start_of_day
 from apps.order.models import Order, Payment
 
 
-class OrderFilter(FilterSet):
-    id = django_filters.CharFilter(field_name="id", lookup_expr="icontains")
-    created_at = django_filters.DateFromToRangeFilter(field_name="created_at")
-    created_at = django_filters.CharFilter(
-        field_name="created_at", lookup_expr="icontains"
-    )
+def parse_date_prefix(value):
+    """
+    Turn ``YYYY``, ``YYYY-MM`` or ``YYYY-MM-DD`` into the ``[start, end)``
+    dates it covers, or ``None`` if the value is not one of those.
+    """
+    try:
+        parts = [int(part) for part in value.strip().split("-")]
+        if len(parts) == 1:
+            start = date(parts[0], 1, 1)
+            return start, date(parts[0] + 1, 1, 1)
+        if len(parts) == 2:
+            start = date(parts[0], parts[1], 1)
+            days = calendar.monthrange(parts[0], parts[1])[1]
+            return start, start + timedelta(days=days)
+        if len(parts) == 3:
+            start = date(*parts)
+            return start, start + timedelta(days=1)
+    except (TypeError, ValueError, OverflowError):
+        pass
+    return None
+
+
+class CreatedAtFilterSet(FilterSet):
+    """
+    ``created_at_after``/``created_at_before`` (inclusive days) and
+    ``created_at`` (a year, month or day) filters, all applied as a range on
+    ``created_at`` so they can use its indexes.
+    """
+
+    created_at_after = django_filters.DateFilter(method="filter_created_after")
+    created_at_before = django_filters.DateFilter(method="filter_created_before")
+    created_at = django_filters.CharFilter(method="filter_created_on")
+
+    def filter_created_after(self, queryset, name, value):
+        return queryset.filter(created_at__gte=start_of_day(value))
+
+    def filter_created_before(self, queryset, name, value):
+        return queryset.filter(created_at__lt=start_of_day(value + timedelta(days=1)))
+
+    def filter_created_on(self, queryset, name, value):
+        bounds = parse_date_prefix(value)
+        if bounds is None:
+            return queryset.none()
+        start, end = bounds
+        return queryset.filter(
+            created_at__gte=start_of_day(start), created_at__lt=start_of_day(end)
+        )
+
+
+class OrderFilter(CreatedAtFilterSet):
+    id = django_filters.NumberFilter(field_name="id")
+    business_day = django_filters.UUIDFilter(field_name="business_day")
+    hall = django_filters.CharFilter(field_name="hall")
 
     class Meta:
         model = Order
-        fields = ["id", "created_at"]
+        fields = ["id", "created_at", "business_day", "hall"]
 
 
-class PaymentFilter(FilterSet):
-    id = django_filters.CharFilter(field_name="id", lookup_expr="icontains")
-    created_at = django_filters.DateFromToRangeFilter(field_name="created_at")
-    created_at = django_filters.CharFilter(
-        field_name="created_at", lookup_expr="icontains"
-    )
+class PaymentFilter(CreatedAtFilterSet):
+    id = django_filters.NumberFilter(field_name="id")
+    business_day = django_filters.UUIDFilter(field_name="business_day")
     payment_method = django_filters.CharFilter(
         field_name="payment_method", lookup_expr="icontains"
     )
 
     class Meta:
         model = Payment
-        fields = ["id", "created_at", "payment_method"]
+        fields = ["id", "created_at", "business_day", "payment_method"]
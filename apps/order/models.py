@@ -1,4 +1,7 @@
-from django.db import models
+from django.db import models, transaction, IntegrityError
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.db.models import F, Max, OuterRef, Q, Subquery
 from django.utils.translation import gettext_lazy as _
 
 from django.conf import settings
@@ -9,6 +12,7 @@ from django.utils import timezone
 
 from apps.product.models import Product
 from apps.table.models import Table
+from cafe.events import publish_event
 
 
 class BusinessDay(models.Model):
@@ -22,6 +26,12 @@ class BusinessDay(models.Model):
         null=True,
         related_name="day_closed_by_user",
     )
+    class Meta:
+        indexes = [
+            models.Index(fields=["start_time"], name="businessday_start_idx"),
+            models.Index(fields=["end_time"], name="businessday_end_idx"),
+        ]
+
     # def close_day(self, user):
     #     """Close the business day."""
     #     self.end_time = now()
@@ -53,6 +63,34 @@ class Discount(models.Model):
     )
 
 
+class NumberSequenceManager(models.Manager):
+    def next_value(self, name, initial=0):
+        """
+        Atomically advance the named counter and return the new value.
+        ``initial`` (a value or a callable) seeds a counter that does not
+        exist yet; the first value handed out is ``initial + 1``.
+        """
+        with transaction.atomic():
+            if not self.filter(name=name).update(value=F("value") + 1):
+                start = initial() if callable(initial) else initial
+                try:
+                    with transaction.atomic():
+                        self.create(name=name, value=(start or 0) + 1)
+                except IntegrityError:
+                    # Another request created the counter first.
+                    self.filter(name=name).update(value=F("value") + 1)
+            return self.filter(name=name).values_list("value", flat=True).get()
+
+
+class NumberSequence(models.Model):
+    """Locked counter row used to hand out sequential numbers safely."""
+
+    name = models.CharField(max_length=100, unique=True)
+    value = models.PositiveBigIntegerField(default=0)
+
+    objects = NumberSequenceManager()
+
+
 class Order(models.Model):
 
     SHIFT_CHOICES = [
@@ -69,7 +107,10 @@ class Order(models.Model):
     shift = models.CharField(
         max_length=100, default="morning", choices=SHIFT_CHOICES, editable=False
     )
-    kot_number = models.PositiveIntegerField(unique=True, blank=True, null=True)
+    kot_number = models.PositiveIntegerField(blank=True, null=True)
+    # Numbering series the kot_number belongs to: empty for the global
+    # series, or the business day id when KOT numbers reset daily.
+    kot_series = models.CharField(max_length=64, blank=True, default="", editable=False)
 
     final_total = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     vat = models.DecimalField(max_digits=10, decimal_places=2, default=0)
@@ -78,6 +119,8 @@ class Order(models.Model):
     is_paid = models.BooleanField(default=False)
     is_deleted = models.BooleanField(default=False)
     business_day = models.ForeignKey(BusinessDay, on_delete=models.SET_NULL, null=True)
+    # Bumped by every order mutation; clients send it back to detect stale edits
+    version = models.PositiveIntegerField(default=0, editable=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -96,11 +139,47 @@ class Order(models.Model):
         related_name="order_updated_by_user",
     )
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["kot_series", "kot_number"], name="unique_order_kot_number"
+            )
+        ]
+        # Partial indexes for the unpaid and paid order lists, newest first.
+        # Django writes boolean filters as bare columns, which SQLite can only
+        # match against a partial index with the same condition.
+        indexes = [
+            models.Index(
+                fields=["-created_at", "-id"],
+                condition=Q(is_paid=False, is_deleted=False),
+                name="order_open_created_idx",
+            ),
+            models.Index(
+                fields=["-created_at", "-id"],
+                condition=Q(is_paid=True, is_deleted=False),
+                name="order_paid_created_idx",
+            ),
+        ]
+
+    def allocate_kot_number(self):
+        """Take the next KOT number from the current series."""
+        self.kot_series = ""
+        if settings.KOT_NUMBER_PER_BUSINESS_DAY:
+            from apps.order.business_day import get_open_business_day
+
+            business_day = get_open_business_day()
+            if business_day:
+                self.kot_series = str(business_day.id)
+
+        series = self.kot_series
+        self.kot_number = NumberSequence.objects.next_value(
+            f"order_kot_number:{series}",
+            initial=lambda: Order.objects.filter(kot_series=series).aggregate(
+                last=Max("kot_number")
+            )["last"],
+        )
+
     def save(self, *args, **kwargs):
-        # Generate a unique ID if not set
-        if not self.id:
-            last_order = Order.objects.order_by("-id").first()
-            self.id = (last_order.id + 1) if last_order else 1
         # Set created_at to current time if it is None
         if self.created_at is None:
             self.created_at = timezone.now()
@@ -116,33 +195,39 @@ class Order(models.Model):
 
         # make auto kot number
         if not self.kot_number:
-            last_order = Order.objects.order_by("-kot_number").first()
-            self.kot_number = (last_order.kot_number + 1) if last_order else 1
-        # Update the associated table's fields
+            self.allocate_kot_number()
+        # Ensure order hall matches table hall
         if self.table:
-            # Ensure order hall matches table hall
             self.hall = self.table.hall
 
+        # Save the order first so a new order has an id the table can point to
+        super(Order, self).save(*args, **kwargs)
+
+        # Update the associated table's fields
+        if self.table:
             if self.is_paid:
                 # Scenario 2: Order is paid
                 # Reset table fields to their origin
                 self.table.no_of_pax = 0
                 self.table.is_occupied = False
+                if self.table.current_order_id == self.pk:
+                    self.table.current_order = None
             else:
                 # Scenario 1: Order is created or updated (not paid)
                 # Update table fields based on the order
                 self.table.no_of_pax = self.number_of_pax
                 self.table.is_occupied = True
+                self.table.current_order = self
             # Save the table object
             self.table.save()
 
-        super(Order, self).save(*args, **kwargs)
-
     def delete(self, *args, **kwargs):
         # Update the associated table's fields
         if self.table:
             self.table.no_of_pax = 0
             self.table.is_occupied = False
+            if self.table.current_order_id == self.pk:
+                self.table.current_order = None
             self.table.save()
         super(Order, self).delete(*args, **kwargs)
 
@@ -170,8 +255,43 @@ class OrderItems(models.Model):
     )  # Track which pax paid for this item
     notes = models.TextField(null=True, blank=True)
     sub_total = models.DecimalField(max_digits=10, decimal_places=2)
+    # Product details as they were when the line was added
+    unit_price = models.DecimalField(
+        max_digits=10, decimal_places=2, null=True, blank=True
+    )
+    product_name = models.CharField(max_length=255, blank=True, default="")
+    product_name_ar = models.CharField(max_length=255, blank=True, default="")
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["order", "is_printed"], name="orderitem_order_printed_idx"
+            ),
+            models.Index(
+                fields=["order", "product"], name="orderitem_order_product_idx"
+            ),
+        ]
 
     def save(self, *args, **kwargs):
+        self.refresh_totals()
+        super(OrderItems, self).save(*args, **kwargs)
+
+    def snapshot_product(self, product=None):
+        """Copy the product's current price and names onto the line."""
+        product = product or self.product
+        self.unit_price = product.price
+        self.product_name = product.name
+        self.product_name_ar = product.name_ar
+
+    def refresh_totals(self):
+        """
+        Normalize the quantities and recompute ``is_paid`` and ``sub_total``
+        from the line's ``unit_price``, taking it from the product if the
+        line has none yet.
+        """
+        if self.unit_price is None:
+            self.snapshot_product()
+
         # Ensure `quantity` is not None
         self.quantity = self.quantity or 0
 
@@ -188,11 +308,9 @@ class OrderItems(models.Model):
         self.is_paid = self.remaining_quantity == 0
         # self.is_printed = self.quantity_to_print == 0
         # Recalculate sub_total based on remaining_quantity
-        if not self.product.price:
+        if not self.unit_price:
             raise ValueError("Product price must be set to calculate sub_total.")
-        self.sub_total = self.product.price * self.remaining_quantity
-
-        super(OrderItems, self).save(*args, **kwargs)
+        self.sub_total = self.unit_price * self.remaining_quantity
 
 
 class Payment(models.Model):
@@ -218,6 +336,14 @@ class Payment(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["business_day", "created_at"], name="payment_day_created_idx"
+            ),
+            models.Index(fields=["-created_at", "-id"], name="payment_created_idx"),
+        ]
+
     def save(self, *args, **kwargs):
 
         self.amount = self.cash_amount + self.visa_amount  # Ensure consistency
@@ -225,3 +351,60 @@ class Payment(models.Model):
 
     def __str__(self):
         return f"Payment {self.id}"
+
+
+@receiver(post_save, sender=BusinessDay)
+@receiver(post_delete, sender=BusinessDay)
+def business_day_invalidation_receiver(sender, **kwargs):
+    from apps.order.business_day import invalidate_open_business_day
+
+    # After commit, so no request re-caches the day as it was before the write
+    transaction.on_commit(invalidate_open_business_day)
+
+
+def order_event_data(order):
+    return {
+        "id": order.pk,
+        "table": order.table_id,
+        "kot_number": order.kot_number,
+        "grand_total": str(order.grand_total),
+        "is_paid": order.is_paid,
+        "version": order.version,
+    }
+
+
+@receiver(post_save, sender=Order)
+def order_event_receiver(sender, instance, created, **kwargs):
+    if created:
+        event_type = "order.created"
+    elif instance.is_paid:
+        event_type = "order.paid"
+    else:
+        event_type = "order.updated"
+    publish_event(event_type, lambda: order_event_data(instance))
+
+
+@receiver(post_delete, sender=Order)
+def order_deleted_event_receiver(sender, instance, **kwargs):
+    publish_event("order.deleted", {"id": instance.pk, "table": instance.table_id})
+
+
+def backfill_table_current_orders(sender, **kwargs):
+    """Point occupied tables that have no current order at their open order."""
+    Table.objects.filter(is_occupied=True, current_order__isnull=True).update(
+        current_order=Subquery(
+            Order.objects.filter(table=OuterRef("pk"), is_paid=False)
+            .order_by("id")
+            .values("id")[:1]
+        )
+    )
+
+
+def backfill_order_item_snapshots(sender, **kwargs):
+    """Fill the product snapshot on order lines created before it existed."""
+    product = Product.objects.filter(pk=OuterRef("product_id"))
+    OrderItems.objects.filter(unit_price__isnull=True).update(
+        unit_price=Subquery(product.values("price")[:1]),
+        product_name=Subquery(product.values("name")[:1]),
+        product_name_ar=Subquery(product.values("name_ar")[:1]),
+    )
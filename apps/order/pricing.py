@@ -0,0 +1,79 @@
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models import Sum
+from django.utils.timezone import now
+
+from apps.order.models import Order, OrderItems, order_event_data
+from cafe.events import publish_event
+
+
+def quantize_amount(amount):
+    """Round an amount to the configured number of decimal places."""
+    return Decimal(amount).quantize(
+        Decimal(1).scaleb(-settings.ORDER_AMOUNT_DECIMAL_PLACES),
+        rounding=settings.ORDER_AMOUNT_ROUNDING,
+    )
+
+
+def net_of_vat(amount):
+    """The part of a VAT-inclusive amount that is not VAT."""
+    return Decimal(amount) / (1 + settings.ORDER_VAT_RATE)
+
+
+def vat_of(amount):
+    """The VAT contained in a VAT-inclusive amount."""
+    return quantize_amount(Decimal(amount) - net_of_vat(amount))
+
+
+def compute_totals(final_total, discount_value=None):
+    """
+    Order totals for a VAT-inclusive ``final_total``: the VAT it contains and
+    the grand total after the discount, never below zero.
+    """
+    final_total = quantize_amount(final_total or 0)
+    grand_total = max(final_total - (discount_value or Decimal("0.00")), 0)
+    return {
+        "final_total": final_total,
+        "vat": vat_of(final_total),
+        "grand_total": quantize_amount(grand_total),
+    }
+
+
+def price_order(order):
+    """
+    Set ``order``'s totals from its lines and current discount with one
+    aggregate query, without saving.
+    """
+    final_total = OrderItems.objects.filter(order=order).aggregate(
+        total=Sum("sub_total")
+    )["total"]
+    totals = compute_totals(
+        final_total, order.discount.value if order.discount else None
+    )
+    for field, value in totals.items():
+        setattr(order, field, value)
+    return totals
+
+
+def reprice_order(order, **fields):
+    """
+    Recompute ``order``'s totals and write them, together with any extra
+    ``fields``, in a single UPDATE. ``Order.save`` side effects such as the
+    table update do not run, so use ``price_order`` and ``save`` when those
+    are needed.
+    """
+    for field, value in fields.items():
+        setattr(order, field, value)
+    timestamp = now()
+    values = {
+        **price_order(order),
+        **fields,
+        "updated_at": timestamp,
+        "check_out_time": timestamp,
+    }
+    Order.objects.filter(pk=order.pk).update(**values)
+    order.updated_at = order.check_out_time = timestamp
+    # Built at commit, after mutate_order has bumped the version
+    publish_event("order.updated", lambda: order_event_data(order))
+    return values
@@ -1,4 +1,6 @@
 from rest_framework import serializers
+from django.db import transaction
+from django.db.models import Prefetch
 from django.utils.translation import gettext_lazy as _
 from apps.order.models import (
     Order,
@@ -7,6 +9,8 @@ from apps.order.models import (
     Discount,
     BusinessDay,
 )
+from apps.order.pricing import compute_totals
+from apps.product.models import Product
 
 from decimal import Decimal
 from datetime import datetime
@@ -14,9 +18,7 @@ from datetime import datetime
 
 class OrderItemsSerializer(serializers.ModelSerializer):
 
-    product_name = serializers.CharField(source="product.name", read_only=True)
-    product_name_ar = serializers.CharField(source="product.name_ar", read_only=True)
-    product_price = serializers.CharField(source="product.price", read_only=True)
+    product_price = serializers.CharField(source="unit_price", read_only=True)
     product_image = serializers.CharField(source="product.photo", read_only=True)
 
     class Meta:
@@ -42,6 +44,8 @@ class OrderItemsSerializer(serializers.ModelSerializer):
         read_only_fields = [
             "id",
             "order",
+            "product_name",
+            "product_name_ar",
             "sub_total",
             "quantity_to_print",
             "is_paid",
@@ -50,8 +54,17 @@ class OrderItemsSerializer(serializers.ModelSerializer):
         ]
 
 
+class OrderLineSerializer(OrderItemsSerializer):
+    """
+    Order lines nested in ``OrderSerializer``. Products are accepted as raw
+    ids and resolved for all lines at once by the parent serializer.
+    """
+
+    product = serializers.UUIDField(source="product_id")
+
+
 class OrderSerializer(serializers.ModelSerializer):
-    order_items = OrderItemsSerializer(many=True)
+    order_items = OrderLineSerializer(many=True)
     created_at = serializers.SerializerMethodField()
     updated_at = serializers.SerializerMethodField()
     check_in = serializers.SerializerMethodField()
@@ -89,6 +102,7 @@ class OrderSerializer(serializers.ModelSerializer):
             "grand_total",
             "is_paid",
             "is_deleted",
+            "version",
             "created_at",
             "updated_at",
             "created_by",
@@ -110,8 +124,24 @@ class OrderSerializer(serializers.ModelSerializer):
             "vat",
             "kot_number",
             "is_deleted",
+            "version",
         ]
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Load every relation the serializer reads, so lists avoid per-row queries."""
+        return queryset.select_related(
+            "table", "discount", "created_by", "updated_by"
+        ).prefetch_related(
+            Prefetch(
+                "order_items",
+                queryset=OrderItems.objects.select_related("product").only(
+                    *[f.attname for f in OrderItems._meta.concrete_fields],
+                    "product__photo",
+                ),
+            )
+        )
+
     def get_created_at(self, obj):
         return obj.created_at.strftime("%Y-%m-%d")
 
@@ -130,10 +160,34 @@ class OrderSerializer(serializers.ModelSerializer):
 
         return data
 
-    def calculate_grand_total(self, order):
-        # Apply discount and VAT
-        discount_value = order.discount.value if order.discount else Decimal(0.00)
-        return order.final_total - discount_value
+    def validate_order_items(self, order_items):
+        products = Product.objects.in_bulk(
+            {item_data["product_id"] for item_data in order_items}
+        )
+        for item_data in order_items:
+            product = products.get(item_data.pop("product_id"))
+            if product is None:
+                raise serializers.ValidationError(_("Product not found"))
+            item_data["product"] = product
+        return order_items
+
+    def build_order_items(self, order_items_data):
+        """Unsaved order lines with their totals computed from the loaded products."""
+        order_items = []
+        for item_data in order_items_data:
+            order_item = OrderItems(**item_data)
+            order_item.snapshot_product(item_data["product"])
+            order_item.refresh_totals()
+            order_items.append(order_item)
+        return order_items
+
+    def set_order_totals(self, order, order_items):
+        total = sum(
+            (order_item.sub_total for order_item in order_items), Decimal("0.00")
+        )
+        discount_value = order.discount.value if order.discount else None
+        for field, value in compute_totals(total, discount_value).items():
+            setattr(order, field, value)
 
     def get_discount_value(self, obj):
         return obj.discount.value if obj.discount else Decimal(0.00)
@@ -144,27 +198,23 @@ class OrderSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         # Extract order_items data from validated_data
         order_items_data = validated_data.pop("order_items")
+        order_items = self.build_order_items(order_items_data)
 
-        # Create the Order instance
-        order = Order.objects.create(**validated_data)
-
-        # Create OrderItems instances and calculate final_total
-        total = Decimal("0.00")
-        for item_data in order_items_data:
-            order_item = OrderItems.objects.create(order=order, **item_data)
-            total += order_item.sub_total  # Accumulate the subtotal for final total
-
-        # Set final_total and vat after all order items are created
-        order.final_total = total
-        order.vat = total - (total / Decimal("1.05"))  # Assuming 5% VAT
-        order.grand_total = self.calculate_grand_total(order)
-        order.save()  # Save the order to update final_total and vat
+        with transaction.atomic():
+            # Create the Order with its totals already set, then all lines at once
+            order = Order(**validated_data)
+            self.set_order_totals(order, order_items)
+            order.save()
+            for order_item in order_items:
+                order_item.order = order
+            OrderItems.objects.bulk_create(order_items)
 
         return order
 
     def update(self, instance, validated_data):
         # Extract order_items data from validated_data
         order_items_data = validated_data.pop("order_items")
+        order_items = self.build_order_items(order_items_data)
 
         # Update the Order instance
         instance.table = validated_data.get("table", instance.table)
@@ -172,20 +222,15 @@ class OrderSerializer(serializers.ModelSerializer):
             "number_of_pax", instance.number_of_pax
         )
         instance.hall = validated_data.get("hall", instance.hall)
-        instance.save()
+        self.set_order_totals(instance, order_items)
 
-        # Delete existing order_items and create new ones
-        instance.order_items.all().delete()
-        total = Decimal("0.00")
-        for item_data in order_items_data:
-            order_item = OrderItems.objects.create(order=instance, **item_data)
-            total += order_item.sub_total  # Accumulate the subtotal for final total
-
-        # Set final_total and vat after all order items are created
-        instance.final_total = total
-        instance.vat = total - (total / Decimal("1.05"))  # Assuming 5% VAT
-        instance.grand_total = self.calculate_grand_total(instance)
-        instance.save()  # Save the order to update final_total and vat
+        with transaction.atomic():
+            instance.save()
+            # Replace the existing order_items with the new ones
+            instance.order_items.all().delete()
+            for order_item in order_items:
+                order_item.order = instance
+            OrderItems.objects.bulk_create(order_items)
 
         return instance
 
@@ -222,6 +267,13 @@ class PaymentSerializer(serializers.ModelSerializer):
             "id",
         ]
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Load every relation the serializer reads, so lists avoid per-row queries."""
+        return queryset.select_related("created_by").prefetch_related(
+            Prefetch("orders", queryset=Order.objects.only("id"))
+        )
+
     def get_created_at(self, obj):
         return obj.created_at.strftime("%Y-%m-%d %H:%M:%S")
 
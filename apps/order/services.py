@@ -0,0 +1,137 @@
+import time
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction, OperationalError
+from django.db.models import Exists, F, OuterRef, Subquery
+from django.utils.timezone import now
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotFound, ParseError
+
+from apps.order.models import Order, order_event_data
+from apps.table.models import Table, table_event_data
+from cafe.events import publish_event
+
+
+class OrderConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = _(
+        "The order was changed by another user. Please reload it and try again."
+    )
+    default_code = "order_conflict"
+
+
+def lock_order(order_id):
+    """Fetch the order with its row locked until the current transaction ends."""
+    queryset = Order.objects.select_related("table", "discount")
+    if connection.features.has_select_for_update_of:
+        queryset = queryset.select_for_update(of=("self",))
+    elif connection.features.has_select_for_update:
+        queryset = queryset.select_for_update()
+    try:
+        if not connection.features.has_select_for_update:
+            # SQLite has no row locks. A no-op write takes the database write
+            # lock now, so a concurrent mutation waits in busy_timeout here
+            # instead of failing with "database is locked" when it upgrades
+            # its read lock later on.
+            Order.objects.filter(pk=order_id).update(version=F("version"))
+        return queryset.get(id=order_id)
+    except (Order.DoesNotExist, ValueError, ValidationError):
+        raise NotFound(_("Order does not exist."))
+
+
+def parse_order_version(value):
+    """Turn the optional ``version`` a client sent back into an int."""
+    if value in (None, ""):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ParseError(_("Invalid order version."))
+
+
+def mutate_order(order_id, mutation, expected_version=None):
+    """
+    Run ``mutation(order)`` against a locked order and return its result.
+
+    The order row stays locked for the whole read-modify-write, so concurrent
+    edits of the same order queue up instead of overwriting each other. When
+    ``expected_version`` is given and the order has moved on, ``OrderConflict``
+    (409) is raised instead. Successful mutations bump ``Order.version``; an
+    exception or an error response from ``mutation`` rolls everything back.
+    Lock timeouts, deadlocks and SQLite's "database is locked" errors are
+    retried ``ORDER_MUTATION_RETRIES`` times.
+    """
+    attempts = settings.ORDER_MUTATION_RETRIES
+    for attempt in range(1, attempts + 1):
+        try:
+            with transaction.atomic():
+                order = lock_order(order_id)
+                if expected_version is not None and order.version != expected_version:
+                    raise OrderConflict()
+
+                result = mutation(order)
+
+                if getattr(result, "status_code", status.HTTP_200_OK) >= 400:
+                    transaction.set_rollback(True)
+                else:
+                    Order.objects.filter(pk=order.pk).update(version=F("version") + 1)
+                    order.version += 1
+                return result
+        except OperationalError:
+            if attempt == attempts:
+                raise
+            time.sleep(settings.ORDER_MUTATION_RETRY_DELAY * attempt)
+
+
+def free_tables(table_ids):
+    """
+    Refresh the given tables after some of their orders were removed in bulk.
+    A table that still has an unpaid order points at it, as ``Order.save``
+    would; the others are reset to empty, as ``Order.delete`` does.
+    """
+    open_orders = Order.objects.filter(table=OuterRef("pk"), is_paid=False).order_by(
+        "id"
+    )
+    tables = Table.objects.filter(id__in=table_ids)
+    tables.filter(Exists(open_orders)).update(
+        current_order=Subquery(open_orders.values("id")[:1]),
+        no_of_pax=Subquery(open_orders.values("number_of_pax")[:1]),
+        is_occupied=True,
+        updated_at=now(),
+    )
+    tables.filter(~Exists(open_orders)).update(
+        current_order=None, no_of_pax=0, is_occupied=False, updated_at=now()
+    )
+    for table in Table.objects.filter(id__in=table_ids):
+        publish_event("table.updated", table_event_data(table))
+
+
+def delete_orders(queryset):
+    """
+    Delete the orders in ``queryset`` in bulk and refresh their tables with
+    ``free_tables``.
+    """
+    table_ids = set(queryset.exclude(table=None).values_list("table_id", flat=True))
+    queryset.delete()
+    if table_ids:
+        free_tables(table_ids)
+
+
+def soft_delete_orders(queryset, user):
+    """
+    Mark the orders in ``queryset`` as deleted with one UPDATE. ``update()``
+    skips ``post_save``, so their events are published here.
+    """
+    queryset.update(is_deleted=True, updated_by=user, updated_at=now())
+    for order_id, table_id in queryset.values_list("id", "table_id"):
+        publish_event("order.deleted", {"id": order_id, "table": table_id})
+
+
+def restore_orders(queryset, user):
+    """Undo ``soft_delete_orders`` for the orders in ``queryset``."""
+    queryset.update(is_deleted=False, updated_by=user, updated_at=now())
+    for order in queryset:
+        publish_event("order.updated", order_event_data(order))
@@ -0,0 +1,186 @@
+import re
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.order.business_day import business_days_between
+from apps.order.models import BusinessDay, Order, OrderItems, Payment
+from apps.order.views import (
+    OrderDeletedListView,
+    OrderPaidListView,
+    OrderUnpaidListView,
+    PaymentListView,
+)
+from apps.product.models import Product
+from apps.table.models import Table
+from user.models import User
+
+
+class ListQueryCountTests(TestCase):
+    """A page of orders or payments costs the same queries whatever its size."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(email="admin@cafe.test", password="x")
+        cls.product = Product.objects.create(
+            name="Tea", name_ar="شاي", price=Decimal("2.00")
+        )
+
+    def create_orders(self, count, **fields):
+        orders = []
+        for number in range(count):
+            table = Table.objects.create(
+                table_number=Table.objects.count() + 1, hall="main"
+            )
+            order = Order.objects.create(
+                table=table, number_of_pax=2, created_by=self.user, **fields
+            )
+            OrderItems.objects.create(
+                order=order, product=self.product, quantity=number + 1
+            )
+            orders.append(order)
+        return orders
+
+    def create_payments(self, count):
+        for order in self.create_orders(count, is_paid=True):
+            payment = Payment.objects.create(
+                amount=Decimal("2.00"),
+                payment_method="cash",
+                cash_amount=Decimal("2.00"),
+                created_by=self.user,
+            )
+            payment.orders.add(order)
+
+    def list_results(self, view):
+        request = APIRequestFactory().get("/", {"page_size": 50})
+        force_authenticate(request, user=self.user)
+        response = view.as_view()(request)
+        response.render()
+        self.assertEqual(response.status_code, 200)
+        return response.data["results"]
+
+    def assert_constant_queries(self, view, create):
+        create(2)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(len(self.list_results(view)), 2)
+        create(8)
+        with self.assertNumQueries(len(queries)):
+            self.assertEqual(len(self.list_results(view)), 10)
+
+    def test_unpaid_orders(self):
+        self.assert_constant_queries(OrderUnpaidListView, self.create_orders)
+
+    def test_paid_orders(self):
+        self.assert_constant_queries(
+            OrderPaidListView, lambda count: self.create_orders(count, is_paid=True)
+        )
+
+    def test_deleted_orders(self):
+        self.assert_constant_queries(
+            OrderDeletedListView,
+            lambda count: self.create_orders(count, is_deleted=True),
+        )
+
+    def test_payments(self):
+        self.assert_constant_queries(PaymentListView, self.create_payments)
+
+
+class HotQueryPlanTests(TestCase):
+    """The hot list and lookup queries are served from an index."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(email="admin@cafe.test", password="x")
+        cls.product = Product.objects.create(
+            name="Tea", name_ar="شاي", price=Decimal("2.00")
+        )
+        cls.table = Table.objects.create(table_number=1, hall="main")
+        cls.business_day = BusinessDay.objects.create(start_time=timezone.now())
+        cls.order = Order.objects.create(
+            table=cls.table, number_of_pax=2, created_by=cls.user
+        )
+
+    def assert_uses_index(self, queryset, index):
+        """
+        ``queryset`` is planned through ``index`` (matched as a prefix, so
+        Django's hashed FK index names work) and never falls back to a
+        plain table scan.
+        """
+        plan = queryset.explain()
+        self.assertRegex(plan, rf"USING (COVERING )?INDEX {re.escape(index)}")
+        for line in plan.splitlines():
+            self.assertFalse(
+                re.search(r"\bSCAN\b", line) and "USING" not in line,
+                f"Full scan in plan:\n{plan}",
+            )
+
+    def test_order_lists(self):
+        for is_paid, index in (
+            (False, "order_open_created_idx"),
+            (True, "order_paid_created_idx"),
+        ):
+            with self.subTest(is_paid=is_paid):
+                self.assert_uses_index(
+                    Order.objects.filter(is_paid=is_paid, is_deleted=False)
+                    .order_by("-created_at", "-id")[:50],
+                    index,
+                )
+
+    def test_orders_by_business_day(self):
+        self.assert_uses_index(
+            Order.objects.filter(business_day=self.business_day),
+            "order_order_business_day_id",
+        )
+
+    def test_payments_by_business_day(self):
+        self.assert_uses_index(
+            Payment.objects.filter(business_day=self.business_day).order_by(
+                "created_at"
+            ),
+            "payment_day_created_idx",
+        )
+
+    def test_payment_list(self):
+        self.assert_uses_index(
+            Payment.objects.order_by("-created_at", "-id")[:50], "payment_created_idx"
+        )
+
+    def test_order_items(self):
+        self.assert_uses_index(
+            OrderItems.objects.filter(order=self.order, is_printed=False),
+            "orderitem_order_printed_idx",
+        )
+        self.assert_uses_index(
+            OrderItems.objects.filter(order=self.order, product=self.product),
+            "orderitem_order_product_idx",
+        )
+
+    def test_product_list(self):
+        self.assert_uses_index(
+            Product.objects.filter(is_deleted=False).order_by("-created_at", "-id")[
+                :50
+            ],
+            "product_live_created_idx",
+        )
+
+    def test_occupied_tables(self):
+        self.assert_uses_index(
+            Table.objects.filter(is_active=True, is_occupied=True).order_by(
+                "table_number"
+            ),
+            "table_occupied_number_idx",
+        )
+
+    def test_business_day_lookups(self):
+        today = timezone.localdate()
+        self.assert_uses_index(
+            BusinessDay.objects.filter(end_time__isnull=True).order_by("-start_time"),
+            "businessday_end_idx",
+        )
+        self.assert_uses_index(
+            business_days_between(today, today), "businessday_start_idx"
+        )
@@ -1,7 +1,6 @@
 from django.shortcuts import get_object_or_404
 from django.utils.translation import gettext_lazy as _
-from django.db import transaction
-from django.db.models import Sum, Q
+from django.db import IntegrityError, transaction
 from django.utils.timezone import now
 from django.conf import settings
 from django.http import FileResponse, Http404
@@ -18,7 +17,6 @@ from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
 
 
-from rest_framework_simplejwt.authentication import JWTAuthentication
 
 from apps.order.models import (
     Order,
@@ -39,10 +37,27 @@ from apps.order.serializers import (
     BusinessDaySerializer,
 )
 from apps.order.filters import OrderFilter, PaymentFilter
-from apps.printer.models import Printer
-from apps.category.models import Category
+from apps.order.business_day import (
+    business_day_for_date,
+    business_days_between,
+    get_open_business_day,
+    retry_with_fresh_business_day,
+    start_of_day,
+)
+from apps.order.services import (
+    delete_orders,
+    mutate_order,
+    parse_order_version,
+    restore_orders,
+    soft_delete_orders,
+)
+from apps.order.pricing import price_order, reprice_order, vat_of
+from apps.printer.registry import printer_registry
 
-from cafe.pagination import StandardResultsSetPagination
+from cafe.bulk import bulk_action, bulk_response
+from cafe.events import publish_event
+from cafe.idempotency import idempotent
+from cafe.pagination import StandardResultsSetPagination, KeysetResultsSetPagination
 from cafe.custom_permissions import HasPermissionOrInGroupWithPermission
 from cafe.util import (
     # bills
@@ -67,13 +82,14 @@ from cafe.util import (
 
 from decimal import Decimal
 import os
+import uuid
+from functools import partial
 from datetime import timedelta
 
 
 # Order Views
 class OrderCreateView(generics.CreateAPIView):
     serializer_class = OrderSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "order.add_order"
 
@@ -95,44 +111,54 @@ class OrderCreateView(generics.CreateAPIView):
 
 class OrderAddMoreItems(generics.CreateAPIView):
     serializer_class = OrderItemsSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def create(self, request, *args, **kwargs):
         # Get the order_id from the URL parameters
-        order_id = request.query_params.get("order_id")
-        try:
-            order = Order.objects.get(id=order_id)
-        except Order.DoesNotExist:
-            return Response(
-                {"detail": _("Order does not exist.")},
-                status=status.HTTP_404_NOT_FOUND,
-            )
+        return mutate_order(
+            request.query_params.get("order_id"),
+            lambda order: self.add_items(request, order),
+            expected_version=parse_order_version(request.query_params.get("version")),
+        )
+
+    def add_items(self, request, order):
         if order.is_paid:
             return Response(
                 {"detail": _("Order is already paid, You can not add more items")},
                 status=status.HTTP_400_BAD_REQUEST,
             )
         items = request.data
-        new_items = []  # To store newly added items for printing
-
-        # Calculate the total for new items
-        new_items_total = Decimal("0.00")
 
-        for item_data in items:
-            product_id = item_data.get("product")
+        # Load every referenced product and the order's current lines at once
+        try:
+            product_ids = [
+                uuid.UUID(str(item_data.get("product"))) for item_data in items
+            ]
+        except ValueError:
+            return Response(
+                {"detail": _("Invalid product ID.")},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        products = Product.objects.in_bulk(set(product_ids))
+        if any(product_id not in products for product_id in product_ids):
+            return Response(
+                {"detail": _("Product not found")},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        order_items = {}
+        for order_item in OrderItems.objects.filter(
+            order=order, product_id__in=products
+        ):
+            order_items.setdefault(str(order_item.product_id), order_item)
+
+        # Merge the posted lines into existing ones, or start new lines
+        new_items, updated_items = [], {}
+        for item_data, product_id in zip(items, product_ids):
+            product = products.get(product_id)
             quantity = int(item_data.get("quantity", 1))  # Default quantity to 1
             notes = item_data.get("notes")
-            try:
-                product = Product.objects.get(id=product_id)
-            except Product.DoesNotExist:
-                return Response(
-                    {"detail": _("Product not found")},
-                    status=status.HTTP_404_NOT_FOUND,
-                )
 
-            # Check if the product is already in the order
-            order_item = OrderItems.objects.filter(order=order, product=product).first()
+            order_item = order_items.get(str(product.id))
             if order_item:
                 # Update the quantity and remaining_quantity
                 order_item.quantity += quantity
@@ -140,11 +166,11 @@ class OrderAddMoreItems(generics.CreateAPIView):
                 order_item.remaining_quantity += quantity  # Add to remaining_quantity
                 order_item.quantity_to_print += quantity  # Add to quantity_to_print
                 order_item.is_printed = False
-                order_item.save()
-                new_items_total += order_item.sub_total
+                if not any(order_item is new_item for new_item in new_items):
+                    updated_items[order_item.pk] = order_item
             else:
                 # Create a new order item with quantity and remaining_quantity
-                order_item = OrderItems.objects.create(
+                order_item = OrderItems(
                     order=order,
                     product=product,
                     notes=notes,
@@ -153,24 +179,27 @@ class OrderAddMoreItems(generics.CreateAPIView):
                     quantity_to_print=quantity,
                     is_printed=False,
                 )
+                order_items[str(product.id)] = order_item
                 new_items.append(order_item)
-                new_items_total += order_item.sub_total
-
-        # Recalculate final_total and vat for the order
-        order.final_total = OrderItems.objects.filter(order=order).aggregate(
-            total=Sum("sub_total")
-        )["total"] or Decimal("0.00")
-        order.vat = order.final_total - (
-            order.final_total / Decimal("1.05")
-        )  # Assuming 5% VAT
-        # Apply discount if applicable
-        discount_value = order.discount.value if order.discount else Decimal("0.00")
-        # Calculate grand_total
-        order.grand_total = order.final_total - discount_value
-        # Ensure grand_total is non-negative (in case of large discounts)
-        if order.grand_total < Decimal("0.00"):
-            order.grand_total = Decimal("0.00")
-        order.save()
+                order_item.snapshot_product(product)
+            order_item.refresh_totals()
+
+        OrderItems.objects.bulk_create(new_items)
+        OrderItems.objects.bulk_update(
+            updated_items.values(),
+            [
+                "quantity",
+                "notes",
+                "remaining_quantity",
+                "quantity_to_print",
+                "is_printed",
+                "is_paid",
+                "sub_total",
+            ],
+        )
+
+        # Recalculate final_total, vat and grand_total for the order
+        reprice_order(order)
 
         return Response(
             {"detail": _("Items added to order successfully")},
@@ -181,7 +210,6 @@ class OrderAddMoreItems(generics.CreateAPIView):
 class OrderItemNote(generics.UpdateAPIView):
     queryset = OrderItems.objects.all()
     serializer_class = OrderItemsSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
     lookup_field = "id"
 
@@ -206,55 +234,13 @@ class OrderItemNote(generics.UpdateAPIView):
 
 
 class OrderPrintNewItems(generics.GenericAPIView):
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
 
-    def get_all_categories(self, category):
-        """Recursively fetch all parent and child categories."""
-        categories = set()
-        categories.add(category)
-
-        # Get all parent categories
-        parent = category.parent
-        while parent:
-            categories.add(parent)
-            print(f"Found parent: {parent.name}")
-            parent = parent.parent
-
-        # Get all child categories
-        def get_children(cat):
-            children = Category.objects.filter(parent=cat)
-            for child in children:
-                categories.add(child)
-                print(f"Found child: {child.name}")
-                get_children(child)
-
-        get_children(category)
-
-        print(
-            f"Final category set for '{category.name}': {[c.name for c in categories]}"
-        )
-        return categories
-
-    def category_matches(self, item, target_category_name):
+    def category_matches(self, item, category_ids):
         """Check if a product belongs to a category or any of its subcategories."""
-        target_category_name = target_category_name.lower()  # Normalize input
-
-        for category in item.product.category.all():
-            all_categories = self.get_all_categories(category)  # Fetch full hierarchy
-
-            # Debugging output: Print all category names being checked
-            print(
-                f"Checking item '{item.product.name}' against category '{target_category_name}'"
-            )
-            print("All related categories:", [c.name.lower() for c in all_categories])
-
-            if any(c.name.lower() == target_category_name for c in all_categories):
-                print(f" Match found: '{target_category_name}' in {category.name}")
-                return True
-
-        print(f" No match for '{target_category_name}' in item '{item.product.name}'")
-        return False
+        return any(
+            category.id in category_ids for category in item.product.category.all()
+        )
 
     def post(self, request, *args, **kwargs):
         order_id = request.query_params.get("order_id")
@@ -267,7 +253,9 @@ class OrderPrintNewItems(generics.GenericAPIView):
             )
 
         # Get unprinted items
-        new_items = OrderItems.objects.filter(order=order, is_printed=False)
+        new_items = OrderItems.objects.filter(
+            order=order, is_printed=False
+        ).prefetch_related("product__category")
 
         if not new_items.exists():
             return Response(
@@ -276,19 +264,22 @@ class OrderPrintNewItems(generics.GenericAPIView):
             )
 
         # Fetch the printers
-        barista_printer = Printer.objects.filter(printer_type="barista").first()
-        shisha_printer = Printer.objects.filter(printer_type="shisha").first()
-        kitchen_printer = Printer.objects.filter(printer_type="kitchen").first()
+        barista_printer = printer_registry.printer("barista")
+        shisha_printer = printer_registry.printer("shisha")
+        kitchen_printer = printer_registry.printer("kitchen")
 
         # Group items by category, including subcategories
+        drinks_ids = printer_registry.station_category_ids("barista")
+        shisha_ids = printer_registry.station_category_ids("shisha")
+        food_ids = printer_registry.station_category_ids("kitchen")
         barista_items = [
-            item for item in new_items if self.category_matches(item, "drinks")
+            item for item in new_items if self.category_matches(item, drinks_ids)
         ]
         shisha_items = [
-            item for item in new_items if self.category_matches(item, "shisha")
+            item for item in new_items if self.category_matches(item, shisha_ids)
         ]
         kitchen_items = [
-            item for item in new_items if self.category_matches(item, "food")
+            item for item in new_items if self.category_matches(item, food_ids)
         ]
 
         # Prepare text output for each category
@@ -305,9 +296,9 @@ class OrderPrintNewItems(generics.GenericAPIView):
             barista_text.append("---------")
             for item in barista_items:
                 barista_text.append(
-                    f"{item.product.name} - {item.quantity_to_print} Nos"
+                    f"{item.product_name} - {item.quantity_to_print} Nos"
                 )
-                barista_text.append(f"{item.product.name_ar}")
+                barista_text.append(f"{item.product_name_ar}")
                 barista_text.append(f"Notes: {item.notes}")
                 barista_text.append("---------")
             print_to_printer(barista_printer.ip_address, "\n".join(barista_text))
@@ -324,10 +315,10 @@ class OrderPrintNewItems(generics.GenericAPIView):
 
             for item in shisha_items:
                 shisha_text.append(
-                    f"{item.product.name} - {item.quantity_to_print} Nos"
+                    f"{item.product_name} - {item.quantity_to_print} Nos"
                 )
                 shisha_text.append(f"Notes: {item.notes}")
-                shisha_text.append(f"{item.product.name_ar}")
+                shisha_text.append(f"{item.product_name_ar}")
             print_to_printer(shisha_printer.ip_address, "\n".join(shisha_text))
 
         # Print for food
@@ -341,9 +332,9 @@ class OrderPrintNewItems(generics.GenericAPIView):
             kitchen_text.append("---------")
             for item in kitchen_items:
                 kitchen_text.append(
-                    f"{item.product.name} - {item.quantity_to_print} Nos"
+                    f"{item.product_name} - {item.quantity_to_print} Nos"
                 )
-                kitchen_text.append(f"{item.product.name_ar}")
+                kitchen_text.append(f"{item.product_name_ar}")
                 kitchen_text.append(f"Notes: {item.notes}")
             print_to_printer(kitchen_printer.ip_address, "\n".join(kitchen_text))
 
@@ -352,6 +343,16 @@ class OrderPrintNewItems(generics.GenericAPIView):
             quantity_to_print=0,
             is_printed=True,
         )
+        publish_event(
+            "order.printed",
+            {
+                "id": order.id,
+                "table": order.table_id,
+                "barista": bool(barista_text),
+                "shisha": bool(shisha_text),
+                "kitchen": bool(kitchen_text),
+            },
+        )
 
         return Response(
             {
@@ -369,62 +370,36 @@ class OrderPrintNewItems(generics.GenericAPIView):
 
 
 class OrderRemoveItems(generics.DestroyAPIView):
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = OrderItemsSerializer
 
-    def get_all_categories(self, category):
-        """Recursively fetch all parent and child categories."""
-        categories = set()
-        categories.add(category)
-
-        # Get all parent categories
-        parent = category.parent
-        while parent:
-            categories.add(parent)
-            parent = parent.parent
-
-        # Get all child categories
-        def get_children(cat):
-            children = Category.objects.filter(parent=cat)
-            for child in children:
-                categories.add(child)
-                get_children(child)
-
-        get_children(category)
-        return categories
-
-    def category_matches(self, item, target_category_name):
+    def category_matches(self, item, category_ids):
         """Check if a product belongs to a category or any of its subcategories."""
-        target_category_name = target_category_name.lower()
-
-        for category in item.product.category.all():
-            all_categories = self.get_all_categories(category)
-            if any(c.name.lower() == target_category_name for c in all_categories):
-                return True
-        return False
+        return any(
+            category.id in category_ids for category in item.product.category.all()
+        )
 
     def destroy(self, request, *args, **kwargs):
-        order_id = request.query_params.get("order_id")
-        try:
-            order = Order.objects.get(id=order_id)
-        except Order.DoesNotExist:
-            return Response(
-                {"detail": _("Order does not exist.")},
-                status=status.HTTP_404_NOT_FOUND,
-            )
+        return mutate_order(
+            request.query_params.get("order_id"),
+            lambda order: self.remove_items(request, order),
+            expected_version=parse_order_version(request.query_params.get("version")),
+        )
 
+    def remove_items(self, request, order):
         items = request.data
         cancel_reason = items[0].get("cancel_reason") if items else None
         removed_items = []
-        removed_items_total = Decimal("0.00")
 
         # Fetch printers
-        barista_printer = Printer.objects.filter(printer_type="barista").first()
-        shisha_printer = Printer.objects.filter(printer_type="shisha").first()
-        kitchen_printer = Printer.objects.filter(printer_type="kitchen").first()
+        barista_printer = printer_registry.printer("barista")
+        shisha_printer = printer_registry.printer("shisha")
+        kitchen_printer = printer_registry.printer("kitchen")
 
         barista_text, shisha_text, kitchen_text = [], [], []
+        drinks_ids = printer_registry.station_category_ids("barista")
+        shisha_ids = printer_registry.station_category_ids("shisha")
+        food_ids = printer_registry.station_category_ids("kitchen")
 
         for item_data in items:
             product_id = item_data.get("product")
@@ -445,7 +420,7 @@ class OrderRemoveItems(generics.DestroyAPIView):
                 return Response(
                     {
                         "detail": _(
-                            f"Item '{order_item.product.name}' is already canceled and cannot be removed again."
+                            f"Item '{order_item.product_name}' is already canceled and cannot be removed again."
                         )
                     },
                     status=status.HTTP_400_BAD_REQUEST,
@@ -455,10 +430,7 @@ class OrderRemoveItems(generics.DestroyAPIView):
             if quantity_to_remove > order_item.quantity:
                 quantity_to_remove = order_item.quantity  # Limit removal
 
-            removed_items.append(order_item.product.name)
-            removed_items_total += (
-                order_item.sub_total / order_item.quantity
-            ) * quantity_to_remove
+            removed_items.append(order_item.product_name)
 
             # Update item details (without deleting)
             if order_item.is_printed:
@@ -483,42 +455,47 @@ class OrderRemoveItems(generics.DestroyAPIView):
                 f"Order No: {order.id} - Table No: {order.table.table_number}",
                 f"Order Time: {order_time}",
                 f"Cancel Time: {current_time}",
-                f"Removed Item: {order_item.product.name} - {quantity_to_remove} Nos",
-                f"              {order_item.product.name_ar}",
+                f"Removed Item: {order_item.product_name} - {quantity_to_remove} Nos",
+                f"              {order_item.product_name_ar}",
                 f"Cancel Reason: {cancel_reason}",
             ]
 
             if (
                 order_item.is_printed
-                and self.category_matches(order_item, "drinks")
+                and self.category_matches(order_item, drinks_ids)
                 and barista_printer
             ):
                 barista_text.extend(item_text)
-                print_to_printer(barista_printer.ip_address, "\n".join(barista_text))
 
             if (
                 order_item.is_printed
-                and self.category_matches(order_item, "shisha")
+                and self.category_matches(order_item, shisha_ids)
                 and shisha_printer
             ):
                 shisha_text.extend(item_text)
-                print_to_printer(shisha_printer.ip_address, "\n".join(shisha_text))
 
             if (
                 order_item.is_printed
-                and self.category_matches(order_item, "food")
+                and self.category_matches(order_item, food_ids)
                 and kitchen_printer
             ):
                 kitchen_text.extend(item_text)
-                print_to_printer(kitchen_printer.ip_address, "\n".join(kitchen_text))
 
         # Update order totals
-        order.final_total -= removed_items_total
-        order.final_total = max(0, order.final_total)  # Ensure no negative totals
-        order.vat = order.final_total - (order.final_total / Decimal("1.05"))
-        discount_value = order.discount.value if order.discount else Decimal("0.00")
-        order.grand_total = max(Decimal("0.00"), order.final_total - discount_value)
-        order.save()
+        reprice_order(order)
+
+        # Send one cancel ticket per station, only once the removal is committed
+        for station_printer, text in (
+            (barista_printer, barista_text),
+            (shisha_printer, shisha_text),
+            (kitchen_printer, kitchen_text),
+        ):
+            if station_printer and text:
+                transaction.on_commit(
+                    partial(
+                        print_to_printer, station_printer.ip_address, "\n".join(text)
+                    )
+                )
 
         return Response(
             {
@@ -535,7 +512,6 @@ class OrderRemoveItems(generics.DestroyAPIView):
 
 
 class OrderChangeTableView(generics.UpdateAPIView):
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "order.change_order"
     lookup_field = "id"
@@ -573,14 +549,19 @@ class OrderChangeTableView(generics.UpdateAPIView):
 
         # Check if the old table is still in use
         if old_table:
+            old_table.current_order = (
+                Order.objects.filter(table=old_table, is_paid=False)
+                .order_by("id")
+                .first()
+            )
             old_table_in_use = Order.objects.filter(table=old_table).exists()
             print(f"Old table in use: {old_table_in_use}")  # Debugging line
             if not old_table_in_use:
                 old_table.is_occupied = False
-                old_table.save()
                 print(
                     f"Old table {old_table.id} marked as unoccupied."
                 )  # Debugging line
+            old_table.save()
 
         # Mark the new table as occupied
         new_table.is_occupied = True
@@ -594,7 +575,6 @@ class OrderChangeTableView(generics.UpdateAPIView):
 
 class ApplyDiscountToOrderView(generics.UpdateAPIView):
     serializer_class = OrderSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "order.add_discount"
     lookup_field = "id"
@@ -604,8 +584,13 @@ class ApplyDiscountToOrderView(generics.UpdateAPIView):
         return get_object_or_404(Order, id=order_id)
 
     def update(self, request, *args, **kwargs):
-        order = self.get_object()
+        return mutate_order(
+            request.query_params.get("order_id"),
+            lambda order: self.update_discount(request, order),
+            expected_version=parse_order_version(request.query_params.get("version")),
+        )
 
+    def update_discount(self, request, order):
         # Check if the order is already paid
         if order.is_paid:
             return Response(
@@ -632,15 +617,8 @@ class ApplyDiscountToOrderView(generics.UpdateAPIView):
             updated_by=request.user,
         )
 
-        # Apply discount to order
-        order.discount = discount
-        order.grand_total = order.final_total - discount_value
-
-        # Ensure grand_total is not negative
-        order.grand_total = max(order.grand_total, Decimal("0.00"))
-
-        # Save updated order
-        order.save()
+        # Apply discount to order and recalculate its totals
+        reprice_order(order, discount=discount)
 
         return Response(
             {"detail": _("Discount applied successfully")},
@@ -650,7 +628,6 @@ class ApplyDiscountToOrderView(generics.UpdateAPIView):
 
 class RemoveDiscountFromOrderView(generics.UpdateAPIView):
     serializer_class = OrderSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "discount.delete_discount"
     lookup_field = "id"
@@ -661,8 +638,13 @@ class RemoveDiscountFromOrderView(generics.UpdateAPIView):
         return order
 
     def update(self, request, *args, **kwargs):
-        order = self.get_object()
+        return mutate_order(
+            request.query_params.get("order_id"),
+            lambda order: self.update_discount(request, order),
+            expected_version=parse_order_version(request.query_params.get("version")),
+        )
 
+    def update_discount(self, request, order):
         # Check if the order is already paid
         if order.is_paid:
             return Response(
@@ -678,16 +660,7 @@ class RemoveDiscountFromOrderView(generics.UpdateAPIView):
             )
 
         # Remove the discount and recalculate grand total
-        discount_value = order.discount.value
-        order.discount = None  # Remove the applied discount
-        order.grand_total += discount_value  # Recalculate the grand total by adding the discount value back
-
-        # Ensure total is not negative
-        if order.grand_total < Decimal("0.00"):
-            order.grand_total = Decimal("0.00")
-
-        # Save the updated order
-        order.save()
+        reprice_order(order, discount=None)
 
         return Response(
             {"detail": _("Discount removed and grand total recalculated successfully")},
@@ -696,19 +669,32 @@ class RemoveDiscountFromOrderView(generics.UpdateAPIView):
 
 
 class SplitBillView(generics.CreateAPIView):
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
 
+    @idempotent
     def create(self, request, *args, **kwargs):
-        order_id = request.query_params.get("order_id")
         try:
-            order = Order.objects.get(id=order_id)
-        except Order.DoesNotExist:
+            return retry_with_fresh_business_day(
+                lambda: mutate_order(
+                    request.query_params.get("order_id"),
+                    lambda order: self.split_bill(request, order),
+                    expected_version=parse_order_version(
+                        request.query_params.get("version")
+                    ),
+                )
+            )
+        except OrderItems.DoesNotExist:
             return Response(
-                {"detail": _("Order not found.")},
+                {"error": _("Order item not found for the specified product.")},
                 status=status.HTTP_404_NOT_FOUND,
             )
+        except ValueError as e:
+            return Response(
+                {"error": str(e)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
+    def split_bill(self, request, order):
         if order.is_paid:
             return Response(
                 {"detail": _("Cannot split an order because it's already fully paid.")},
@@ -726,194 +712,152 @@ class SplitBillView(generics.CreateAPIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        try:
-            total_payment_amount = Decimal("0.00")
-            selected_items = []
+        total_payment_amount = Decimal("0.00")
+        selected_items = []
 
-            with transaction.atomic():
-                # 🔹 Find the last open business day
-                last_business_day = (
-                    BusinessDay.objects.filter(end_time__isnull=True)
-                    .order_by("-start_time")
-                    .first()
-                )
-
-                if not last_business_day:
-                    return Response(
-                        {
-                            "error": _(
-                                "No active business day found. Please start a new business day."
-                            )
-                        },
-                        status=status.HTTP_400_BAD_REQUEST,
-                    )
-
-                for item_data in items:
-                    product_id = item_data.get("product")
-                    quantity_to_pay = item_data.get("quantity")
-
-                    if not product_id or quantity_to_pay is None:
-                        return Response(
-                            {"detail": _("Product ID and quantity are required.")},
-                            status=status.HTTP_400_BAD_REQUEST,
-                        )
+        # 🔹 Find the last open business day
+        last_business_day = get_open_business_day(verify=True)
 
-                    order_item = OrderItems.objects.get(
-                        product__id=product_id, order=order
+        if not last_business_day:
+            return Response(
+                {
+                    "error": _(
+                        "No active business day found. Please start a new business day."
                     )
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-                    if quantity_to_pay > order_item.remaining_quantity:
-                        return Response(
-                            {
-                                "detail": _(
-                                    "Quantity exceeds remaining unpaid quantity."
-                                )
-                            },
-                            status=status.HTTP_400_BAD_REQUEST,
-                        )
-
-                    item_total = Decimal(quantity_to_pay) * order_item.product.price
-                    total_payment_amount += item_total
+        for item_data in items:
+            product_id = item_data.get("product")
+            quantity_to_pay = item_data.get("quantity")
 
-                    order_item.remaining_quantity -= quantity_to_pay
+            if not product_id or quantity_to_pay is None:
+                return Response(
+                    {"detail": _("Product ID and quantity are required.")},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
 
-                    if order_item.remaining_quantity == 0:
-                        order_item.is_paid = True
+            order_item = OrderItems.objects.get(product__id=product_id, order=order)
 
-                    order_item.sub_total = (
-                        order_item.remaining_quantity * order_item.product.price
-                    )
-                    order_item.save()
+            if quantity_to_pay > order_item.remaining_quantity:
+                return Response(
+                    {"detail": _("Quantity exceeds remaining unpaid quantity.")},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
 
-                    selected_items.append(
-                        {"product": order_item.product, "quantity": quantity_to_pay}
-                    )
+            item_total = Decimal(quantity_to_pay) * order_item.unit_price
+            total_payment_amount += item_total
 
-                vat = total_payment_amount - (total_payment_amount / Decimal("1.05"))
+            order_item.remaining_quantity -= quantity_to_pay
 
-                # Handle different payment methods
-                if payment_method == "multi":
-                    try:
-                        cash_amount = Decimal(cash_amount)
-                        visa_amount = Decimal(visa_amount)
-                    except ValueError:
-                        return Response(
-                            {"detail": _("Invalid cash or visa amount.")},
-                            status=status.HTTP_400_BAD_REQUEST,
-                        )
+            if order_item.remaining_quantity == 0:
+                order_item.is_paid = True
 
-                    if cash_amount + visa_amount != total_payment_amount:
-                        return Response(
-                            {
-                                "detail": _(
-                                    "Cash and Visa amounts must sum to the total amount."
-                                )
-                            },
-                            status=status.HTTP_400_BAD_REQUEST,
-                        )
+            order_item.sub_total = order_item.remaining_quantity * order_item.unit_price
+            order_item.save()
 
-                elif payment_method == "cash":
-                    cash_amount, visa_amount = total_payment_amount, 0
-                elif payment_method == "card":
-                    cash_amount, visa_amount = 0, total_payment_amount
-                else:
-                    return Response(
-                        {"detail": _("Invalid payment method.")},
-                        status=status.HTTP_400_BAD_REQUEST,
-                    )
+            selected_items.append(
+                {"order_item": order_item, "quantity": quantity_to_pay}
+            )
 
-                # 🔹 Create payment and assign to business day
-                payment = Payment.objects.create(
-                    amount=total_payment_amount,
-                    payment_method=payment_method,
-                    cash_amount=cash_amount,
-                    visa_amount=visa_amount,
-                    created_by=request.user,
-                    business_day=last_business_day,  # Assign payment to business day
-                )
-                payment.orders.add(order)
+        vat = vat_of(total_payment_amount)
 
-                # Generate the formatted bill **after** payment is created
-                formatted_bill, logo_path, pdf_path = split_format_bill(
-                    order,
-                    payment.id,
-                    selected_items,
-                    total_payment_amount,
-                    vat,
-                    save_as_pdf=True,
+        # Handle different payment methods
+        if payment_method == "multi":
+            try:
+                cash_amount = Decimal(cash_amount)
+                visa_amount = Decimal(visa_amount)
+            except ValueError:
+                return Response(
+                    {"detail": _("Invalid cash or visa amount.")},
+                    status=status.HTTP_400_BAD_REQUEST,
                 )
 
-                # Print receipt if a cashier printer exists
-                cashier_printer = Printer.objects.filter(printer_type="cashier").first()
-                if cashier_printer:
-                    try:
-                        # print_to_printer(
-                        #     cashier_printer.ip_address, formatted_bill, logo_path
-                        # )
-                        # print_bill_escpos(order,payment.id,grand_total,order.vat,cashier_printer.ip_address,logo_path)
-
-                        print_split_bill_escpos(
-                            order,
-                            payment.id,
-                            selected_items,
-                            total_payment_amount,
-                            vat,
-                            cashier_printer.ip_address,
-                            logo_path=logo_path,
+            if cash_amount + visa_amount != total_payment_amount:
+                return Response(
+                    {
+                        "detail": _(
+                            "Cash and Visa amounts must sum to the total amount."
                         )
-                    except Exception as e:
-                        print(f"Printing failed for order {order.id}: {e}")
-
-                self.recalculate_order(
-                    order, last_business_day
-                )  # Assign business day to order
-
-            return Response(
-                {
-                    "detail": _("Bill split successfully."),
-                    # "formatted_bill": formatted_bill,
-                    "pdf_path": request.build_absolute_uri(pdf_path),
-                    "payment_id": payment.id,
-                },
-                status=status.HTTP_200_OK,
-            )
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
 
-        except OrderItems.DoesNotExist:
-            return Response(
-                {"error": _("Order item not found for the specified product.")},
-                status=status.HTTP_404_NOT_FOUND,
-            )
-        except ValueError as e:
+        elif payment_method == "cash":
+            cash_amount, visa_amount = total_payment_amount, 0
+        elif payment_method == "card":
+            cash_amount, visa_amount = 0, total_payment_amount
+        else:
             return Response(
-                {"error": str(e)},
+                {"detail": _("Invalid payment method.")},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        except Exception as e:
-            return Response(
-                {"error": str(e)},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            )
 
-    def recalculate_order(self, order, business_day):
-        """Recalculates order totals after splitting a bill."""
-        order_items = OrderItems.objects.filter(order=order)
-
-        final_total = sum(
-            (
-                Decimal(item.remaining_quantity) * item.product.price
-                for item in order_items
-            )
+        # 🔹 Create payment and assign to business day
+        payment = Payment.objects.create(
+            amount=total_payment_amount,
+            payment_method=payment_method,
+            cash_amount=cash_amount,
+            visa_amount=visa_amount,
+            created_by=request.user,
+            business_day=last_business_day,  # Assign payment to business day
+        )
+        payment.orders.add(order)
+
+        self.recalculate_order(order, last_business_day)  # Assign business day to order
+
+        # Generate the formatted bill **after** payment is created
+        formatted_bill, logo_path, pdf_path = split_format_bill(
+            order,
+            payment.id,
+            selected_items,
+            total_payment_amount,
+            vat,
+            save_as_pdf=True,
         )
 
-        vat = final_total - (final_total / Decimal("1.05"))
+        def print_bill():
+            # Print receipt if a cashier printer exists
+            try:
+                cashier_printer = printer_registry.printer("cashier")
+                if cashier_printer:
+                    # print_to_printer(
+                    #     cashier_printer.ip_address, formatted_bill, logo_path
+                    # )
+                    # print_bill_escpos(order,payment.id,grand_total,order.vat,cashier_printer.ip_address,logo_path)
+
+                    print_split_bill_escpos(
+                        order,
+                        payment.id,
+                        selected_items,
+                        total_payment_amount,
+                        vat,
+                        cashier_printer.ip_address,
+                        logo_path=logo_path,
+                    )
+            except Exception as e:
+                print(f"Printing failed for order {order.id}: {e}")
 
-        discount_value = order.discount.value if order.discount else Decimal("0.00")
+        # Only the receipt waits for the commit, so a rolled back split is
+        # never printed and printer I/O happens outside the order lock
+        transaction.on_commit(print_bill)
 
-        order.final_total = final_total
-        order.vat = vat.quantize(Decimal("0.01"))
-        order.grand_total = max(order.final_total - discount_value, Decimal("0.00"))
+        return Response(
+            {
+                "detail": _("Bill split successfully."),
+                # "formatted_bill": formatted_bill,
+                "pdf_path": request.build_absolute_uri(pdf_path),
+                "payment_id": payment.id,
+            },
+            status=status.HTTP_200_OK,
+        )
 
-        if all(item.is_paid for item in order_items):
+    def recalculate_order(self, order, business_day):
+        """Recalculates order totals after splitting a bill."""
+        price_order(order)
+
+        if not OrderItems.objects.filter(order=order, is_paid=False).exists():
             order.is_paid = True
             order.check_out_time = now()
 
@@ -922,7 +866,6 @@ class SplitBillView(generics.CreateAPIView):
 
 
 class GenerateBillView(generics.RetrieveAPIView):
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
     queryset = Order.objects.filter(is_paid=False)
     serializer_class = OrderSerializer
@@ -955,7 +898,7 @@ class GenerateBillView(generics.RetrieveAPIView):
         )
 
         # Optionally print the bill
-        cashier_printer = Printer.objects.filter(printer_type="cashier").first()
+        cashier_printer = printer_registry.printer("cashier")
         if cashier_printer:
             try:
                 # print_to_printer(cashier_printer.ip_address, formatted_bill, logo_path)
@@ -980,7 +923,6 @@ class GenerateBillView(generics.RetrieveAPIView):
 
 
 class CheckoutOrderView(generics.UpdateAPIView):
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
     queryset = Order.objects.all()
     serializer_class = OrderSerializer
@@ -989,9 +931,19 @@ class CheckoutOrderView(generics.UpdateAPIView):
         order_id = self.request.query_params.get("order_id")
         return get_object_or_404(Order, id=order_id)
 
+    @idempotent
     def update(self, request, *args, **kwargs):
-        order = self.get_object()
+        return retry_with_fresh_business_day(
+            lambda: mutate_order(
+                request.query_params.get("order_id"),
+                lambda order: self.checkout(request, order),
+                expected_version=parse_order_version(
+                    request.query_params.get("version")
+                ),
+            )
+        )
 
+    def checkout(self, request, order):
         if order.is_paid:
             return Response(
                 {"detail": _("Order is already checked out.")},
@@ -1047,14 +999,8 @@ class CheckoutOrderView(generics.UpdateAPIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-        order_items = list(OrderItems.objects.filter(order=order))
-
         # 🔹 Find the last open business day
-        last_business_day = (
-            BusinessDay.objects.filter(end_time__isnull=True)
-            .order_by("-start_time")
-            .first()
-        )
+        last_business_day = get_open_business_day(verify=True)
 
         if not last_business_day:
             return Response(
@@ -1066,48 +1012,63 @@ class CheckoutOrderView(generics.UpdateAPIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        # The items being paid for, as they are before checkout, for the bill
+        billed_items = list(order.order_items.filter(remaining_quantity__gt=0))
+
         # 🔹 Assign the order and payment to the last business day
-        with transaction.atomic():
-            payment = Payment.objects.create(
-                amount=grand_total,
-                payment_method=payment_method,
-                cash_amount=cash_amount,
-                visa_amount=visa_amount,
-                created_by=request.user,
-                business_day=last_business_day,  # Assign payment to business day
-            )
-            payment.orders.add(order)
+        payment = Payment.objects.create(
+            amount=grand_total,
+            payment_method=payment_method,
+            cash_amount=cash_amount,
+            visa_amount=visa_amount,
+            created_by=request.user,
+            business_day=last_business_day,  # Assign payment to business day
+        )
+        payment.orders.add(order)
 
-            order.is_paid = True
-            order.check_out_time = now()
-            order.business_day = last_business_day  # Assign order to business day
-            order.save()
+        order.is_paid = True
+        order.check_out_time = now()
+        order.business_day = last_business_day  # Assign order to business day
+        order.save()
+
+        # Update order items
+        for item in OrderItems.objects.filter(order=order):
+            item.is_paid = True
+            item.remaining_quantity = 0
+            item.save()
 
         #  Move `format_bill` **after** creating payment
         formatted_bill, logo_path, pdf_path = format_bill(
-            order, payment.id, grand_total, order.vat, save_as_pdf=True
+            order,
+            payment.id,
+            grand_total,
+            order.vat,
+            save_as_pdf=True,
+            order_items=billed_items,
         )
 
-        # Print receipt if a cashier printer exists
-        cashier_printer = Printer.objects.filter(printer_type="cashier").first()
-        if cashier_printer:
+        def print_bill():
+            # Print receipt if a cashier printer exists
             try:
-                # print_to_printer(cashier_printer.ip_address, formatted_bill, logo_path)
-                print_bill_escpos(
-                    order,
-                    payment.id,
-                    grand_total,
-                    order.vat,
-                    cashier_printer.ip_address,
-                    logo_path=logo_path,
-                )
+                cashier_printer = printer_registry.printer("cashier")
+                if cashier_printer:
+                    # print_to_printer(cashier_printer.ip_address, formatted_bill, logo_path)
+                    print_bill_escpos(
+                        order,
+                        payment.id,
+                        grand_total,
+                        order.vat,
+                        cashier_printer.ip_address,
+                        logo_path=logo_path,
+                        order_items=billed_items,
+                    )
             except Exception as e:
                 print(f"Failed to print order {order.id}: {e}")
-        # Update order items
-        for item in order_items:
-            item.is_paid = True
-            item.remaining_quantity = 0
-            item.save()
+
+        # Only the receipt waits for the commit, so a rolled back checkout is
+        # never printed and printer I/O happens outside the order lock
+        transaction.on_commit(print_bill)
+
         response_data = {
             "detail": _("Order checked out and payment recorded successfully."),
             "bill": formatted_bill,
@@ -1120,10 +1081,13 @@ class CheckoutOrderView(generics.UpdateAPIView):
 
 
 class GroupBillsView(generics.CreateAPIView):
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
 
+    @idempotent
     def create(self, request, *args, **kwargs):
+        return retry_with_fresh_business_day(lambda: self.group_bills(request))
+
+    def group_bills(self, request):
         order_ids = request.data.get("order_ids")
         if not order_ids:
             return Response({"error": _("Order IDs are required.")}, status=400)
@@ -1153,11 +1117,7 @@ class GroupBillsView(generics.CreateAPIView):
 
             with transaction.atomic():
                 # 🔹 Find the last open business day
-                last_business_day = (
-                    BusinessDay.objects.filter(end_time__isnull=True)
-                    .order_by("-start_time")
-                    .first()
-                )
+                last_business_day = get_open_business_day(verify=True)
 
                 if not last_business_day:
                     return Response(
@@ -1221,7 +1181,7 @@ class GroupBillsView(generics.CreateAPIView):
                 )
 
                 # Print the combined bill if a cashier printer exists
-                cashier_printer = Printer.objects.filter(printer_type="cashier").first()
+                cashier_printer = printer_registry.printer("cashier")
                 if cashier_printer:
                     try:
                         # print_to_printer(
@@ -1254,6 +1214,8 @@ class GroupBillsView(generics.CreateAPIView):
                 status=200,
             )
 
+        except IntegrityError:
+            raise
         except Exception as e:
             return Response({"error": str(e)}, status=500)
 
@@ -1281,11 +1243,10 @@ class FetchInvoiceView(GenericAPIView):
 
 
 class OrderUnpaidListView(generics.ListAPIView):
-    queryset = Order.objects.filter(is_paid=False, is_deleted=False).order_by(
-        "-created_at"
+    queryset = OrderSerializer.setup_eager_loading(
+        Order.objects.filter(is_paid=False, is_deleted=False).order_by("-created_at")
     )
     serializer_class = OrderSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "order.view_order"
     pagination_class = StandardResultsSetPagination
@@ -1293,25 +1254,69 @@ class OrderUnpaidListView(generics.ListAPIView):
     filterset_class = OrderFilter
     ordering_fields = ["id", "created_at"]
 
+    def list(self, request, *args, **kwargs):
+        # ?view=summary: compact rows for the floor screen, read with values()
+        if request.query_params.get("view") != "summary":
+            return super().list(request, *args, **kwargs)
+
+        queryset = (
+            self.filter_queryset(self.get_queryset())
+            .select_related(None)
+            .prefetch_related(None)
+            .values(
+                "id",
+                "kot_number",
+                "table",
+                "table__table_number",
+                "hall",
+                "number_of_pax",
+                "grand_total",
+                "version",
+                "created_at",
+            )
+        )
+        page = self.paginate_queryset(queryset)
+        rows = page if page is not None else queryset
+
+        current_time = now()
+        results = [
+            {
+                "id": row["id"],
+                "kot_number": row["kot_number"],
+                "table": row["table"],
+                "table_number": row["table__table_number"],
+                "hall": row["hall"],
+                "number_of_pax": row["number_of_pax"],
+                "grand_total": str(row["grand_total"]),
+                "version": row["version"],
+                "created_at": row["created_at"],
+                "age": int((current_time - row["created_at"]).total_seconds()),
+            }
+            for row in rows
+        ]
+        if page is not None:
+            return self.get_paginated_response(results)
+        return Response(results)
+
 
 class OrderPaidListView(generics.ListAPIView):
-    queryset = Order.objects.filter(is_paid=True, is_deleted=False).order_by(
-        "-created_at"
+    queryset = OrderSerializer.setup_eager_loading(
+        Order.objects.filter(is_paid=True, is_deleted=False).order_by("-created_at")
     )
     serializer_class = OrderSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "order.view_order"
-    pagination_class = StandardResultsSetPagination
+    pagination_class = KeysetResultsSetPagination
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_class = OrderFilter
     ordering_fields = ["id", "created_at"]
 
 
 class OrderDeletedListView(generics.ListAPIView):
-    queryset = Order.objects.filter(is_deleted=True).order_by("-created_at")
+    queryset = OrderSerializer.setup_eager_loading(
+        Order.objects.filter(is_deleted=True).order_by("-created_at")
+    )
     serializer_class = OrderSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "order.view_order"
     pagination_class = StandardResultsSetPagination
@@ -1322,29 +1327,24 @@ class OrderDeletedListView(generics.ListAPIView):
 
 class OrderRetrieve(generics.RetrieveAPIView):
     serializer_class = OrderSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "order.view_order"
     lookup_field = "id"
 
     def get_object(self):
         order_id = self.request.query_params.get("order_id")
-        order = get_object_or_404(Order, id=order_id)
+        order = get_object_or_404(
+            OrderSerializer.setup_eager_loading(Order.objects.all()), id=order_id
+        )
         return order
 
 
 class OrderDeleteTemporaryView(generics.UpdateAPIView):
     serializer_class = OrderDeletedSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "order.delete_order"
 
-    def perform_update(self, serializer):
-        serializer.save(updated_by=self.request.user)
-
     def update(self, request, *args, **kwargs):
-        order_ids = request.data.get("order_id", [])
-        partial = kwargs.pop("partial", False)
         is_deleted = request.data.get("is_deleted")
 
         if is_deleted == False:
@@ -1352,43 +1352,23 @@ class OrderDeleteTemporaryView(generics.UpdateAPIView):
                 {"detail": _("These orders are not deleted")},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        for order_id in order_ids:
-            instance = get_object_or_404(Order, id=order_id)
-            if instance.is_deleted:
-                return Response(
-                    {
-                        "detail": _(
-                            "Product with ID {} is already temp deleted".format(
-                                order_id
-                            )
-                        )
-                    },
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-            instance.is_active = False
-            instance.save()
-            serializer = self.get_serializer(
-                instance, data=request.data, partial=partial
-            )
-            serializer.is_valid(raise_exception=True)
-            self.perform_update(serializer)
-
-        return Response(
-            {"detail": _("Orders temp deleted successfully")},
-            status=status.HTTP_200_OK,
+        results, count = bulk_action(
+            Order,
+            request.data.get("order_id", []),
+            lambda orders: soft_delete_orders(orders, request.user),
+            done="deleted",
+            skip=("is_deleted", True, "already_deleted"),
         )
+        return bulk_response(results, count, _("Orders temp deleted successfully"))
 
 
 class OrderRestoreView(generics.RetrieveUpdateAPIView):
 
     serializer_class = OrderDeletedSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "order.delete_order"
 
     def update(self, request, *args, **kwargs):
-        order_ids = request.data.get("order_id", [])
-        partial = kwargs.pop("partial", False)
         is_deleted = request.data.get("is_deleted")
 
         if is_deleted == True:
@@ -1396,39 +1376,29 @@ class OrderRestoreView(generics.RetrieveUpdateAPIView):
                 {"detail": _("Products are already deleted")},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        for order_id in order_ids:
-            instance = get_object_or_404(Order, id=order_id)
-            if instance.is_deleted == False:
-                return Response(
-                    {"detail": _("Product with ID {} is not deleted".format(order_id))},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-            instance.is_active = True
-
-            serializer = self.get_serializer(
-                instance, data=request.data, partial=partial
-            )
-            serializer.is_valid(raise_exception=True)
-            self.perform_update(serializer)
-
-        return Response(
-            {"detail": _("Orders restored successfully")}, status=status.HTTP_200_OK
+        results, count = bulk_action(
+            Order,
+            request.data.get("order_id", []),
+            lambda orders: restore_orders(orders, request.user),
+            done="restored",
+            skip=("is_deleted", False, "not_deleted"),
         )
+        return bulk_response(results, count, _("Orders restored successfully"))
 
 
 class OrderDeleteView(generics.DestroyAPIView):
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "order.delete_order"
 
     def delete(self, request, *args, **kwargs):
-        order_ids = request.data.get("order_id", [])
-        for order_id in order_ids:
-            instance = get_object_or_404(Order, id=order_id)
-            instance.delete()
-        return Response(
-            {"detail": _("Order permanently deleted successfully")},
-            status=status.HTTP_204_NO_CONTENT,
+        results, count = bulk_action(
+            Order, request.data.get("order_id", []), delete_orders, done="deleted"
+        )
+        return bulk_response(
+            results,
+            count,
+            _("Order permanently deleted successfully"),
+            success_status=status.HTTP_204_NO_CONTENT,
         )
 
 
@@ -1436,12 +1406,13 @@ class OrderDeleteView(generics.DestroyAPIView):
 
 
 class PaymentListView(generics.ListAPIView):
-    queryset = Payment.objects.all().order_by("-created_at")
+    queryset = PaymentSerializer.setup_eager_loading(
+        Payment.objects.all().order_by("-created_at")
+    )
     serializer_class = PaymentSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "payment.view_payment"
-    pagination_class = StandardResultsSetPagination
+    pagination_class = KeysetResultsSetPagination
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_class = PaymentFilter
     ordering_fields = ["id", "created_at"]
@@ -1449,35 +1420,39 @@ class PaymentListView(generics.ListAPIView):
 
 class PaymentRetrieveView(generics.RetrieveAPIView):
     serializer_class = PaymentSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "payment.view_payment"
     lookup_field = "id"
 
     def get_object(self):
         payment_id = self.request.query_params.get("payment_id")
-        payment = get_object_or_404(Payment, id=payment_id)
+        payment = get_object_or_404(
+            PaymentSerializer.setup_eager_loading(Payment.objects.all()),
+            id=payment_id,
+        )
         return payment
 
 
 class PaymentDeleteView(generics.DestroyAPIView):
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "order.delete_payment"
 
     def delete(self, request, *args, **kwargs):
-        payment_ids = request.data.get("payment_id", [])
-        for payment_id in payment_ids:
-            instance = get_object_or_404(Payment, id=payment_id)
-            instance.delete()
-        return Response(
-            {"detail": _("Payment permanently deleted successfully")},
-            status=status.HTTP_204_NO_CONTENT,
+        results, count = bulk_action(
+            Payment,
+            request.data.get("payment_id", []),
+            lambda payments: payments.delete(),
+            done="deleted",
+        )
+        return bulk_response(
+            results,
+            count,
+            _("Payment permanently deleted successfully"),
+            success_status=status.HTTP_204_NO_CONTENT,
         )
 
 
 class PaymentMethodDialogView(APIView):
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request, *args, **kwargs):
@@ -1493,7 +1468,6 @@ class PaymentMethodDialogView(APIView):
 # discount Views
 class DiscountCreateView(generics.CreateAPIView):
     serializer_class = DiscountSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "discount.add_discount"
 
@@ -1516,7 +1490,6 @@ class DiscountCreateView(generics.CreateAPIView):
 class DiscountListView(generics.ListAPIView):
     queryset = Discount.objects.filter(is_active=True).order_by("-id")
     serializer_class = DiscountSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "discount.view_discount"
     pagination_class = StandardResultsSetPagination
@@ -1525,7 +1498,6 @@ class DiscountListView(generics.ListAPIView):
 class DiscountInactiveListView(generics.ListAPIView):
     queryset = Discount.objects.filter(is_active=False).order_by("-id")
     serializer_class = DiscountSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "discount.view_discount"
     pagination_class = StandardResultsSetPagination
@@ -1533,7 +1505,6 @@ class DiscountInactiveListView(generics.ListAPIView):
 
 class DiscountRetrieveView(generics.RetrieveAPIView):
     serializer_class = DiscountSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "discount.view_discount"
     lookup_field = "id"
@@ -1546,7 +1517,6 @@ class DiscountRetrieveView(generics.RetrieveAPIView):
 
 class DiscountUpdateView(generics.UpdateAPIView):
     serializer_class = DiscountSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "discount.change_discount"
     lookup_field = "id"
@@ -1573,55 +1543,53 @@ class DiscountUpdateView(generics.UpdateAPIView):
 
 class DiscountChangeStatusView(generics.UpdateAPIView):
     serializer_class = DiscountActiveSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "discount.change_discount"
 
-    def perform_update(self, serializer):
-        serializer.save(updated_by=self.request.user)
-
     def update(self, request, *args, **kwargs):
-        discount_ids = request.data.get("discount_id", [])
-        partial = kwargs.pop("partial", False)
         is_active = request.data.get("is_active")
         if is_active is None:
             return Response(
                 {"detail": _("'is_active' field is required")},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        for discount_id in discount_ids:
-            instance = get_object_or_404(Discount, id=discount_id)
-            serializer = self.get_serializer(
-                instance, data=request.data, partial=partial
-            )
-            serializer.is_valid(raise_exception=True)
-            self.perform_update(serializer)
-        return Response(
-            {"detail": _("Discount status changed successfully")},
-            status=status.HTTP_200_OK,
+        serializer = self.get_serializer(data={"is_active": is_active})
+        serializer.is_valid(raise_exception=True)
+        is_active = serializer.validated_data["is_active"]
+
+        results, count = bulk_action(
+            Discount,
+            request.data.get("discount_id", []),
+            lambda discounts: discounts.update(
+                is_active=is_active, updated_by=request.user, updated_at=now()
+            ),
+            done="updated",
         )
+        return bulk_response(results, count, _("Discount status changed successfully"))
 
 
 class DiscountDeleteView(generics.DestroyAPIView):
     serializer_class = DiscountSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "discount.delete_discount"
 
     def delete(self, request, *args, **kwargs):
-        discount_ids = request.data.get("discount_id", [])
-        for discount_id in discount_ids:
-            instance = get_object_or_404(Discount, id=discount_id)
-            instance.delete()
-        return Response(
-            {"detail": _("Discount permanently deleted successfully")},
-            status=status.HTTP_204_NO_CONTENT,
+        results, count = bulk_action(
+            Discount,
+            request.data.get("discount_id", []),
+            lambda discounts: discounts.delete(),
+            done="deleted",
+        )
+        return bulk_response(
+            results,
+            count,
+            _("Discount permanently deleted successfully"),
+            success_status=status.HTTP_204_NO_CONTENT,
         )
 
 
 class CloseDayAPIView(generics.CreateAPIView):
     serializer_class = BusinessDaySerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "order.add_businessday"
 
@@ -1672,22 +1640,24 @@ class CloseDayAPIView(generics.CreateAPIView):
 class CloseDayListView(generics.ListAPIView):
     queryset = BusinessDay.objects.all()
     serializer_class = BusinessDaySerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
 
 
 class CloseDayDeleteView(generics.DestroyAPIView):
     permission_classes = [IsAuthenticated]
-    authentication_classes = [JWTAuthentication]
 
     def delete(self, request, *args, **kwargs):
-        businessday_ids = request.data.get("closeday_id", [])
-        for businessday_id in businessday_ids:
-            instance = get_object_or_404(BusinessDay, id=businessday_id)
-            instance.delete()
-        return Response(
-            {"detail": _("Business day deleted successfully.")},
-            status=status.HTTP_204_NO_CONTENT,
+        results, count = bulk_action(
+            BusinessDay,
+            request.data.get("closeday_id", []),
+            lambda business_days: business_days.delete(),
+            done="deleted",
+        )
+        return bulk_response(
+            results,
+            count,
+            _("Business day deleted successfully."),
+            success_status=status.HTTP_204_NO_CONTENT,
         )
 
 
@@ -1696,7 +1666,6 @@ class XReportView(generics.GenericAPIView):
     Generate X Report, save as PDF, print the report, and return file path.
     """
 
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request, *args, **kwargs):
@@ -1717,16 +1686,7 @@ class XReportView(generics.GenericAPIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        business_day = (
-            BusinessDay.objects.filter(
-                Q(start_time__date__lte=parsed_day)
-                & (
-                    Q(end_time__date__gte=parsed_day) | Q(end_time__isnull=True)
-                )  # Ensures the day is ongoing or ended after parsed_day
-            )
-            .order_by("-start_time")
-            .first()
-        )
+        business_day = business_day_for_date(parsed_day)
         if not business_day:
             return Response(
                 {"detail": _("No business day found for this date.")},
@@ -1771,7 +1731,6 @@ class XReportViewWithoutPrint(generics.GenericAPIView):
     Generate X Report, save as PDF, print the report, and return file path.
     """
 
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request, *args, **kwargs):
@@ -1792,16 +1751,7 @@ class XReportViewWithoutPrint(generics.GenericAPIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        business_day = (
-            BusinessDay.objects.filter(
-                Q(start_time__date__lte=parsed_day)
-                & (
-                    Q(end_time__date__gte=parsed_day) | Q(end_time__isnull=True)
-                )  # Ensures the day is ongoing or ended after parsed_day
-            )
-            .order_by("-start_time")
-            .first()
-        )
+        business_day = business_day_for_date(parsed_day)
         if not business_day:
             return Response(
                 {"detail": _("No business day found for this date.")},
@@ -1831,7 +1781,6 @@ class XReportForPeriodView(generics.GenericAPIView):
     Generate X Report for a period (from date to date), save as PDF, and return file path.
     """
 
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request, *args, **kwargs):
@@ -1865,10 +1814,7 @@ class XReportForPeriodView(generics.GenericAPIView):
             )
 
         # Fetch business days that fall within the given period
-        business_days = BusinessDay.objects.filter(
-            Q(start_time__date__lte=parsed_to_date)
-            & (Q(end_time__date__gte=parsed_from_date) | Q(end_time__isnull=True))
-        ).order_by("start_time")
+        business_days = business_days_between(parsed_from_date, parsed_to_date)
 
         if not business_days.exists():
             return Response(
@@ -1919,7 +1865,6 @@ class ZReportView(generics.GenericAPIView):
     save it as a PDF, and print it.
     """
 
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request, *args, **kwargs):
@@ -1938,7 +1883,7 @@ class ZReportView(generics.GenericAPIView):
 
         # **Prevent creating a new business day if one already exists for today**
         existing_business_day = BusinessDay.objects.filter(
-            start_time__date=current_time.date(), end_time__isnull=True
+            start_time__gte=start_of_day(current_time.date()), end_time__isnull=True
         ).first()
 
         if existing_business_day:
@@ -1988,25 +1933,13 @@ class SalesReportView(generics.GenericAPIView):
     Generate Sales Report, save as PDF, print the report, and return file path.
     """
 
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get_business_day(self, day):
         """
         Fetches the latest business day that includes the given date.
         """
-        return (
-            BusinessDay.objects.filter(
-                Q(
-                    start_time__date__lte=day
-                )  # Business day started before or on the given day
-                & (
-                    Q(end_time__date__gte=day) | Q(end_time__isnull=True)
-                )  # Business day still open or ended after the given day
-            )
-            .order_by("-start_time")  # Get the most recent matching business day
-            .first()
-        )
+        return business_day_for_date(day)
 
     def get(self, request, *args, **kwargs):
         day = request.query_params.get("day")
@@ -2073,7 +2006,6 @@ class SalesReportView(generics.GenericAPIView):
 
 class BusinessDayCreateView(generics.CreateAPIView):
     serializer_class = BusinessDaySerializer
-    authentication_classes = {JWTAuthentication}
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "order.add_businessday"
 
@@ -6,7 +6,6 @@ from rest_framework.response import Response
 from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated
 
-from rest_framework_simplejwt.authentication import JWTAuthentication
 
 from apps.permissions_api.serializers import (
     PermissionSerializer,
@@ -24,7 +23,6 @@ from user.serializers import UserSerializer
 class PermissionListView(generics.ListAPIView):
     queryset = Permission.objects.all()
     serializer_class = PermissionSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "view_permission"
 
@@ -34,13 +32,11 @@ class PermissionListView(generics.ListAPIView):
 class PermissionDialogView(generics.ListAPIView):
     queryset = Permission.objects.all()
     serializer_class = PermissionDialogSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "view_permission"
 
 
 class AssignPermissionsToGroupView(generics.CreateAPIView):
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "add_permission"
 
@@ -65,7 +61,6 @@ class AssignPermissionsToGroupView(generics.CreateAPIView):
 
 
 class AssignPermissionsToUserView(generics.CreateAPIView):
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "add_permission"
 
@@ -90,7 +85,6 @@ class AssignPermissionsToUserView(generics.CreateAPIView):
 
 
 class RemovePermissionsFromGroupView(generics.UpdateAPIView):
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "change_group"
 
@@ -115,7 +109,6 @@ class RemovePermissionsFromGroupView(generics.UpdateAPIView):
 
 
 class RemovePermissionsFromUserView(generics.UpdateAPIView):
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "change_permission"
 
@@ -143,7 +136,6 @@ class RemovePermissionsFromUserView(generics.UpdateAPIView):
 class GroupListView(generics.ListAPIView):
     queryset = Group.objects.all()
     serializer_class = GroupSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     # permission_codename = "view_group"
     permission_codename = "view_group"
@@ -153,7 +145,6 @@ class GroupListView(generics.ListAPIView):
 
 class GroupRetrieveView(generics.RetrieveAPIView):
     serializer_class = GroupSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "view_group"
     lookup_field = "id"
@@ -166,7 +157,6 @@ class GroupRetrieveView(generics.RetrieveAPIView):
 
 class GroupCreateView(generics.CreateAPIView):
     serializer_class = GroupSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "add_group"
 
@@ -189,7 +179,6 @@ class GroupCreateView(generics.CreateAPIView):
 
 class GroupUpdateView(generics.UpdateAPIView):
     serializer_class = GroupSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "change_group"
 
@@ -224,7 +213,6 @@ class GroupUpdateView(generics.UpdateAPIView):
 
 class GroupUpdatePermissionsView(generics.UpdateAPIView):
     serializer_class = GroupSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "change_group"
 
@@ -253,7 +241,6 @@ class GroupUpdatePermissionsView(generics.UpdateAPIView):
 
 class GroupDeleteView(generics.DestroyAPIView):
     serializer_class = GroupSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "delete_group"
 
@@ -280,14 +267,12 @@ class GroupDeleteView(generics.DestroyAPIView):
 class GroupDialogView(generics.ListAPIView):
     queryset = Group.objects.all()
     serializer_class = GroupDialogSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "view_group"
 
 
 class AssignUserToGroupView(generics.UpdateAPIView):
     serializer_class = UserSerializer  # Replace with your User serializer
-    authentication_classes = [JWTAuthentication]  # Add your authentication classes
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "change_group"
 
@@ -320,7 +305,6 @@ class AssignUserToGroupView(generics.UpdateAPIView):
 
 class AssignManyUsersToGroupView(generics.UpdateAPIView):
     serializer_class = UserSerializer  # Use your User serializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "change_group"
 
@@ -357,7 +341,6 @@ class AssignManyUsersToGroupView(generics.UpdateAPIView):
 class RemoveUserFromGroupView(generics.UpdateAPIView):
     serializer_class = UserSerializer
     queryset = User.objects.all()  # This queryset can be customized based on your needs
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "change_group"
 
@@ -387,7 +370,6 @@ class RemoveUserFromGroupView(generics.UpdateAPIView):
 
 class RemoveManyUsersFromGroupView(generics.UpdateAPIView):
     serializer_class = UserSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "change_group"
 
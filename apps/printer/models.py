@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 from django.utils.translation import gettext_lazy as _
 from django.conf import settings
 import uuid
@@ -32,3 +34,13 @@ class Printer(models.Model):
         blank=True,
         null=True,
     )
+
+
+@receiver(post_save, sender=Printer)
+@receiver(post_delete, sender=Printer)
+@receiver(post_save, sender="category.Category")
+@receiver(post_delete, sender="category.Category")
+def printer_registry_invalidation_receiver(sender, **kwargs):
+    from apps.printer.registry import invalidate_printer_registry
+
+    invalidate_printer_registry()
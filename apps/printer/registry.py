@@ -0,0 +1,140 @@
+import threading
+import time
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.category.models import Category, CategoryClosure
+from apps.printer.models import Printer
+
+
+PRINTER_REGISTRY_VERSION_KEY = "printer_registry:version"
+
+# What each station's printer is used for
+STATION_CAPABILITIES = {
+    "cashier": frozenset({"bill", "report", "logo"}),
+    "barista": frozenset({"ticket"}),
+    "shisha": frozenset({"ticket"}),
+    "kitchen": frozenset({"ticket"}),
+}
+
+# Category (with its subcategories) whose items are sent to each station
+STATION_CATEGORIES = {
+    "barista": "drinks",
+    "shisha": "shisha",
+    "kitchen": "food",
+}
+
+RegisteredPrinter = namedtuple(
+    "RegisteredPrinter", ["id", "name", "name_ar", "station", "ip_address"]
+)
+
+
+def _registry_version():
+    version = cache.get(PRINTER_REGISTRY_VERSION_KEY)
+    if version is None:
+        version = 1
+        cache.add(PRINTER_REGISTRY_VERSION_KEY, version, None)
+    return version
+
+
+def invalidate_printer_registry():
+    """
+    Make every process reload its printers and station categories; called
+    when a Printer or a Category is written.
+    """
+    try:
+        cache.incr(PRINTER_REGISTRY_VERSION_KEY)
+    except ValueError:
+        cache.set(PRINTER_REGISTRY_VERSION_KEY, 2, None)
+
+
+class PrinterRegistry:
+    """
+    In-process map of station (``Printer.printer_type``) to its printers,
+    oldest first, and to the ids of the categories routed to it. It is
+    loaded once and reloaded when the shared registry version changes, so
+    lookups cost a cache read. The version only
+    reaches other worker processes through a shared cache (``CACHE_URL``),
+    so the printers are also reloaded every ``PRINTER_REGISTRY_TIMEOUT``
+    seconds.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._expires = 0
+        self._stations = {}
+        self._category_ids = {}
+
+    def _is_stale(self, version):
+        return version != self._version or time.monotonic() >= self._expires
+
+    def _current(self):
+        version = _registry_version()
+        if self._is_stale(version):
+            with self._lock:
+                if self._is_stale(version):
+                    stations = {}
+                    for printer in Printer.objects.order_by("created_at").values(
+                        "id", "name", "name_ar", "printer_type", "ip_address"
+                    ):
+                        stations.setdefault(printer["printer_type"], []).append(
+                            RegisteredPrinter(
+                                printer["id"],
+                                printer["name"],
+                                printer["name_ar"],
+                                printer["printer_type"],
+                                printer["ip_address"],
+                            )
+                        )
+                    self._stations = stations
+                    self._category_ids = {
+                        station: frozenset(
+                            CategoryClosure.objects.lineage_ids(
+                                Category.objects.filter(name__iexact=name).values("id")
+                            )
+                        )
+                        for station, name in STATION_CATEGORIES.items()
+                    }
+                    self._version = version
+                    self._expires = (
+                        time.monotonic() + settings.PRINTER_REGISTRY_TIMEOUT
+                    )
+        return self._stations
+
+    def printers(self, station):
+        """All printers configured for ``station``."""
+        return list(self._current().get(station, []))
+
+    def printer(self, station):
+        """The printer a station prints to, or ``None`` if it has none."""
+        printers = self._current().get(station)
+        return printers[0] if printers else None
+
+    def capabilities(self, station):
+        return STATION_CAPABILITIES.get(station, frozenset())
+
+    def stations_with(self, capability):
+        """Configured stations whose printers can handle ``capability``."""
+        return [
+            station
+            for station in self._current()
+            if capability in self.capabilities(station)
+        ]
+
+    def station_category(self, station):
+        """Name of the category routed to ``station``."""
+        return STATION_CATEGORIES.get(station)
+
+    def station_category_ids(self, station):
+        """
+        Ids of the category routed to ``station`` together with its parents
+        and subcategories.
+        """
+        self._current()
+        return self._category_ids.get(station, frozenset())
+
+
+printer_registry = PrinterRegistry()
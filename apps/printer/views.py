@@ -11,7 +11,6 @@ from rest_framework import (
     generics,
     status,
 )
-from rest_framework_simplejwt.authentication import JWTAuthentication
 
 from apps.printer.models import Printer
 from apps.printer.serializers import (
@@ -26,7 +25,6 @@ from cafe.custom_permissions import HasPermissionOrInGroupWithPermission
 
 class PrinterCreateView(generics.CreateAPIView):
     serializer_class = PrinterSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "printer.add_printer"
 
@@ -50,7 +48,6 @@ class PrinterCreateView(generics.CreateAPIView):
 class PrinterListView(generics.ListAPIView):
     queryset = Printer.objects.all()
     serializer_class = PrinterSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "printer.view_printer"
     pagination_class = StandardResultsSetPagination
@@ -58,7 +55,6 @@ class PrinterListView(generics.ListAPIView):
 
 class PrinterUpdateView(generics.UpdateAPIView):
     serializer_class = PrinterSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "printer.change_printer"
     lookup_field = "id"
@@ -84,7 +80,6 @@ class PrinterUpdateView(generics.UpdateAPIView):
 
 
 class PrinterDeleteView(generics.DestroyAPIView):
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "printer.delete_printer"
 
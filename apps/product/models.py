@@ -2,7 +2,7 @@ import uuid
 import os
 
 from django.db import models
-from django.db.models.signals import pre_save
+from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed
 from django.core.files.base import ContentFile
 from django.dispatch import receiver
 from django.conf import settings
@@ -70,6 +70,16 @@ class Product(models.Model):
     image = models.ImageField(blank=True, null=True, upload_to=product_image_file_path)
     photo = models.ImageField(blank=True, null=True, upload_to=product_image_file_path)
 
+    class Meta:
+        indexes = [
+            # Live product lists, newest first
+            models.Index(
+                fields=["-created_at", "-id"],
+                condition=models.Q(is_deleted=False),
+                name="product_live_created_idx",
+            ),
+        ]
+
     def save(self, *args, **kwargs):
 
         super().save(*args, **kwargs)
@@ -135,3 +145,18 @@ def pre_save_receiver(sender, instance, *args, **kwargs):
                 instance.slug = unique_slug_generator(instance)
         except sender.DoesNotExist:
             return "can not make a slug for product "
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(m2m_changed, sender=Product.category.through)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Section)
+@receiver(post_delete, sender=Section)
+def menu_snapshot_invalidation_receiver(sender, **kwargs):
+    if kwargs.get("action", "post_").startswith("pre_"):
+        return
+    from apps.product.snapshot import invalidate_menu_snapshot
+
+    invalidate_menu_snapshot()
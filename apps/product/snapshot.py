@@ -0,0 +1,153 @@
+import gzip
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.timezone import now
+
+from apps.category.models import Category
+from apps.product.models import Product
+from apps.section.models import Section
+
+
+MENU_SNAPSHOT_VERSION_KEY = "menu_snapshot:version"
+MENU_SNAPSHOT_CACHE_KEY = "menu_snapshot:{version}:{host}"
+MENU_SNAPSHOT_TIMEOUT = 60 * 60 * 24
+
+
+def _snapshot_version():
+    version = cache.get(MENU_SNAPSHOT_VERSION_KEY)
+    if version is None:
+        version = 1
+        cache.add(MENU_SNAPSHOT_VERSION_KEY, version, None)
+    return version
+
+
+def invalidate_menu_snapshot():
+    """Mark the menu as changed; the next request rebuilds the snapshot."""
+    try:
+        cache.incr(MENU_SNAPSHOT_VERSION_KEY)
+    except ValueError:
+        cache.set(MENU_SNAPSHOT_VERSION_KEY, 2, None)
+
+
+def build_menu_snapshot(version, request=None):
+    """
+    Collect the whole active menu (sections, categories and products with
+    their prices, Arabic names and image URLs) with a handful of queries.
+    """
+
+    def media_url(storage, name):
+        if not name:
+            return None
+        url = storage.url(name)
+        return request.build_absolute_uri(url) if request else url
+
+    section_storage = Section._meta.get_field("image").storage
+    category_storage = Category._meta.get_field("image").storage
+    product_storage = Product._meta.get_field("image").storage
+
+    sections = [
+        {
+            "id": section["id"],
+            "name": section["name"],
+            "name_ar": section["name_ar"],
+            "slug": section["slug"],
+            "image": media_url(section_storage, section["image"]),
+        }
+        for section in Section.objects.filter(is_active=True, is_deleted=False)
+        .order_by("-created_at")
+        .values("id", "name", "name_ar", "slug", "image")
+    ]
+
+    categories = [
+        {
+            "id": category["id"],
+            "parent": category["parent_id"],
+            "name": category["name"],
+            "name_ar": category["name_ar"],
+            "slug": category["slug"],
+            "image": media_url(category_storage, category["image"]),
+        }
+        for category in Category.objects.filter(is_active=True, is_deleted=False)
+        .order_by("-created_at")
+        .values("id", "parent_id", "name", "name_ar", "slug", "image")
+    ]
+
+    product_categories = {}
+    for product_id, category_id in Product.category.through.objects.values_list(
+        "product_id", "category_id"
+    ):
+        product_categories.setdefault(product_id, []).append(category_id)
+
+    products = [
+        {
+            "id": product["id"],
+            "name": product["name"],
+            "name_ar": product["name_ar"],
+            "slug": product["slug"],
+            "description": product["description"],
+            "price": product["price"],
+            "section": product["section_id"],
+            "categories": product_categories.get(product["id"], []),
+            "image": media_url(product_storage, product["image"]),
+            "photo": media_url(product_storage, product["photo"]),
+        }
+        for product in Product.objects.filter(is_active=True, is_deleted=False)
+        .order_by("-created_at")
+        .values(
+            "id",
+            "name",
+            "name_ar",
+            "slug",
+            "description",
+            "price",
+            "section_id",
+            "image",
+            "photo",
+        )
+    ]
+
+    return {
+        "version": version,
+        "generated_at": now(),
+        "sections": sections,
+        "categories": categories,
+        "products": products,
+    }
+
+
+def get_menu_snapshot(request=None):
+    """
+    Return the encoded snapshot for the current menu version as a dict with
+    ``etag``, ``body`` and ``gzip_body``. It is only rebuilt after a
+    Product, Category or Section write bumped the version.
+    """
+    version = _snapshot_version()
+    key = MENU_SNAPSHOT_CACHE_KEY.format(
+        version=version, host=request.get_host() if request else ""
+    )
+    snapshot = cache.get(key)
+    if snapshot is None:
+        menu = build_menu_snapshot(version, request)
+        body = json.dumps(menu, cls=DjangoJSONEncoder, ensure_ascii=False).encode(
+            "utf-8"
+        )
+        # The ETag covers the menu and its version but not ``generated_at``,
+        # so a rebuild of the same menu (another worker, cache eviction)
+        # keeps the same ETag.
+        digest = json.dumps(
+            {name: value for name, value in menu.items() if name != "generated_at"},
+            cls=DjangoJSONEncoder,
+            ensure_ascii=False,
+            sort_keys=True,
+        ).encode("utf-8")
+        snapshot = {
+            "version": version,
+            "etag": hashlib.sha256(digest).hexdigest(),
+            "body": body,
+            "gzip_body": gzip.compress(body),
+        }
+        cache.set(key, snapshot, MENU_SNAPSHOT_TIMEOUT)
+    return snapshot
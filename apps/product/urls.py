@@ -16,6 +16,7 @@ from apps.product.views import (
     ProductRestoreView,
     ProductDeleteView,
     ProductDialogView,
+    MenuSnapshotView,
 )
 
 
@@ -77,4 +78,5 @@ urlpatterns = [
     ),
     path("product_delete/", ProductDeleteView.as_view(), name="product-delete"),
     path("product_dialog/", ProductDialogView.as_view(), name="product-dialog"),
+    path("menu_snapshot/", MenuSnapshotView.as_view(), name="menu-snapshot"),
 ]
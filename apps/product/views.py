@@ -3,18 +3,21 @@ from django.shortcuts import get_object_or_404
 from django.core.exceptions import ObjectDoesNotExist
 from django.contrib.auth.models import AnonymousUser
 from django.db.models import Avg
+from django.http import HttpResponse
+from django.utils.timezone import now
+from django.utils.cache import patch_vary_headers
 
 from django_filters.rest_framework import DjangoFilterBackend
 
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from rest_framework.views import APIView
 from rest_framework.filters import SearchFilter, OrderingFilter
 from rest_framework import (
     generics,
     status,
 )
-from rest_framework_simplejwt.authentication import JWTAuthentication
 
 from apps.product.models import Product
 from apps.product.serializers import (
@@ -26,7 +29,9 @@ from apps.product.serializers import (
     ProductCategoryBulkSerializer,
 )
 from apps.product.filters import ProductFilter
-from cafe.pagination import StandardResultsSetPagination
+from apps.product.snapshot import get_menu_snapshot, invalidate_menu_snapshot
+from cafe.bulk import bulk_action, bulk_response
+from cafe.pagination import StandardResultsSetPagination, KeysetResultsSetPagination
 from cafe.custom_permissions import  HasPermissionOrInGroupWithPermission
 
 from apps.category.models import Category
@@ -35,7 +40,6 @@ from apps.category.models import Category
 # Product views
 class ProductCreateView(generics.CreateAPIView):
     serializer_class = ProductSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename='product.add_product'
 
@@ -88,7 +92,6 @@ class ProductCreateView(generics.CreateAPIView):
 
 class ProductCategoryBulkCreateView(generics.CreateAPIView):
     serializer_class = ProductCategoryBulkSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename='product.add_product'
 
@@ -115,7 +118,6 @@ class ProductCategoryBulkCreateView(generics.CreateAPIView):
 
 class ProductCategoryBulkRemoveView(generics.CreateAPIView):
     serializer_class = ProductCategoryBulkSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename='product.add_product'
 
@@ -140,7 +142,6 @@ class ProductCategoryBulkRemoveView(generics.CreateAPIView):
 
 class ProductCategoryBulkUpdateView(generics.UpdateAPIView):
     serializer_class = ProductCategoryBulkSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename='product.change_product'
 
@@ -168,10 +169,9 @@ class ProductCategoryBulkUpdateView(generics.UpdateAPIView):
 class ProductListView(generics.ListAPIView):
     queryset = Product.objects.filter(is_deleted=False).order_by("-created_at")
     serializer_class = ProductSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename='product.view_product'
-    pagination_class = StandardResultsSetPagination
+    pagination_class = KeysetResultsSetPagination
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_class = ProductFilter
     search_fields = ["name", "name_ar", "description", "slug"]
@@ -186,7 +186,6 @@ class ProductListView(generics.ListAPIView):
 class DeletedProductListView(generics.ListAPIView):
     queryset = Product.objects.filter(is_deleted=True).order_by("-created_at")
     serializer_class = ProductSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename='product.view_product'
     pagination_class = StandardResultsSetPagination
@@ -206,13 +205,17 @@ class DeletedProductListView(generics.ListAPIView):
 class ProductByCategoryView(generics.ListAPIView):
     serializer_class = ProductSerializer
     pagination_class = StandardResultsSetPagination
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename='product.view_product'
     def get_queryset(self):
         category_id = self.request.query_params.get("category_id")
         try:
-            queryset = Product.objects.filter(category=category_id)
+            # Products of the category and of all its subcategories
+            queryset = (
+                Product.objects.filter(category__ancestor_links__ancestor=category_id)
+                .distinct()
+                .order_by("-created_at")
+            )
         except Product.DoesNotExist:
             return Response(
                 {"detail": _("Category is not found")}, status=status.HTTP_404_NOT_FOUND
@@ -222,7 +225,6 @@ class ProductByCategoryView(generics.ListAPIView):
 
 class ProductRetrieveView(generics.RetrieveAPIView):
     serializer_class = ProductSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename='product.view_product'
     lookup_field = "id"
@@ -238,7 +240,6 @@ class ProductActiveListView(generics.ListAPIView):
         "-created_at"
     )
     serializer_class = ProductImageOnlySerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename='product.view_product'
     pagination_class = StandardResultsSetPagination
@@ -256,7 +257,6 @@ class ProductActiveListView(generics.ListAPIView):
 
 class ProductActiveRetrieveView(generics.RetrieveAPIView):
     serializer_class = ProductImageOnlySerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename='product.view_product'
     lookup_field = "id"
@@ -271,7 +271,6 @@ class ProductActiveRetrieveView(generics.RetrieveAPIView):
 
 class ProductChangeActiveView(generics.UpdateAPIView):
     serializer_class = ProductActiveSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename='product.change_product'
 
@@ -303,7 +302,6 @@ class ProductChangeActiveView(generics.UpdateAPIView):
 class ProductUpdateView(generics.UpdateAPIView):
     serializer_class = ProductSerializer
     lookup_field = "id"
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename='product.change_product'
 
@@ -329,16 +327,10 @@ class ProductUpdateView(generics.UpdateAPIView):
 
 class ProductDeleteTemporaryView(generics.UpdateAPIView):
     serializer_class = ProductDeleteSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename='product.change_product'
 
-    def perform_update(self, serializer):
-        serializer.save(updated_by=self.request.user)
-
     def update(self, request, *args, **kwargs):
-        product_ids = request.data.get("product_id", [])
-        partial = kwargs.pop("partial", False)
         is_deleted = request.data.get("is_deleted")
 
         if is_deleted == False:
@@ -346,37 +338,27 @@ class ProductDeleteTemporaryView(generics.UpdateAPIView):
                 {"detail": _("These products are not deleted")},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        for product_id in product_ids:
-            instance = get_object_or_404(Product, id=product_id)
-            if instance.is_deleted:
-                return Response(
-                    {
-                        "detail": _(
-                            "Product with ID {} is already temp deleted".format(
-                                product_id
-                            )
-                        )
-                    },
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-            instance.is_active = False
-            instance.save()
-            serializer = self.get_serializer(
-                instance, data=request.data, partial=partial
-            )
-            serializer.is_valid(raise_exception=True)
-            self.perform_update(serializer)
-
-        return Response(
-            {"detail": _("Products temp deleted successfully")},
-            status=status.HTTP_200_OK,
+        results, count = bulk_action(
+            Product,
+            request.data.get("product_id", []),
+            lambda products: products.update(
+                is_deleted=True,
+                is_active=False,
+                updated_by=request.user,
+                updated_at=now(),
+            ),
+            done="deleted",
+            skip=("is_deleted", True, "already_deleted"),
         )
+        if count:
+            # update() skips the post_save receivers
+            invalidate_menu_snapshot()
+        return bulk_response(results, count, _("Products temp deleted successfully"))
 
 
 class ProductRestoreView(generics.RetrieveUpdateAPIView):
 
     serializer_class = ProductDeleteSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename='product.change_product'
 
@@ -415,7 +397,6 @@ class ProductRestoreView(generics.RetrieveUpdateAPIView):
 
 
 class ProductDeleteView(generics.DestroyAPIView):
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename='product.delete_product'
 
@@ -431,9 +412,46 @@ class ProductDeleteView(generics.DestroyAPIView):
         )
 
 
+class MenuSnapshotView(APIView):
+    """
+    Whole active menu in one response. The body is built once per menu
+    version and served with a strong ETag, precompressed when the client
+    accepts gzip.
+    """
+
+    permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
+    permission_codename = "product.view_product"
+
+    def get(self, request, *args, **kwargs):
+        snapshot = get_menu_snapshot(request)
+        use_gzip = "gzip" in request.META.get("HTTP_ACCEPT_ENCODING", "")
+        etag = '"%s%s"' % (snapshot["etag"], "-gzip" if use_gzip else "")
+
+        if_none_match = request.META.get("HTTP_IF_NONE_MATCH", "")
+        client_etags = {tag.strip() for tag in if_none_match.split(",")}
+        matched = "*" in client_etags or any(
+            tag in client_etags
+            for tag in ('"%s"' % snapshot["etag"], '"%s-gzip"' % snapshot["etag"])
+        )
+
+        if matched:
+            response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = HttpResponse(
+                snapshot["gzip_body"] if use_gzip else snapshot["body"],
+                content_type="application/json; charset=utf-8",
+            )
+            if use_gzip:
+                response["Content-Encoding"] = "gzip"
+        response["ETag"] = etag
+        response["Cache-Control"] = "private, no-cache"
+        response["X-Menu-Version"] = str(snapshot["version"])
+        patch_vary_headers(response, ("Accept-Encoding",))
+        return response
+
+
 # dialog views
 class ProductDialogView(generics.ListAPIView):
     queryset = Product.objects.filter(is_deleted=False)
     serializer_class = ProductDialogSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
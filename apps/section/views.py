@@ -11,7 +11,6 @@ from rest_framework import (
     generics,
     status,
 )
-from rest_framework_simplejwt.authentication import JWTAuthentication
 from apps.section.models import Section, SectionMediaFiles
 from apps.section.serializers import (
     SectionSerializer,
@@ -26,7 +25,6 @@ from cafe.custom_permissions import HasPermissionOrInGroupWithPermission
 
 class SectionCreateView(generics.CreateAPIView):
     serializer_class = SectionSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def perform_create(self, serializer):
@@ -55,7 +53,6 @@ class SectionCreateView(generics.CreateAPIView):
 
 class SectionListView(generics.ListAPIView):
     serializer_class = SectionSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
     queryset = Section.objects.all().order_by("-created_at")
     pagination_class = StandardResultsSetPagination
@@ -78,13 +75,11 @@ class ActiveSectionListView(generics.ListAPIView):
         "-created_at"
     )
     serializer_class = SectionSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
     pagination_class = StandardResultsSetPagination
 
 class SectionChangeActiveView(generics.UpdateAPIView):
     serializer_class = ActiveSectionSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def perform_update(self, serializer):
@@ -115,7 +110,6 @@ class SectionChangeActiveView(generics.UpdateAPIView):
 class SectionUpdateView(generics.UpdateAPIView):
     serializer_class = SectionSerializer
     lookup_field = "section_id"
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get_object(self):
@@ -140,7 +134,6 @@ class SectionUpdateView(generics.UpdateAPIView):
 
 class SectionMediaUpdateView(generics.UpdateAPIView):
     serializer_class = SectionMediaSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
     queryset = SectionMediaFiles.objects.all()
 
@@ -177,7 +170,6 @@ class SectionMediaUpdateView(generics.UpdateAPIView):
 
 class SectionMediaDeleteView(generics.DestroyAPIView):
     serializer_class = SectionMediaSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
     queryset = SectionMediaFiles.objects.all()
 
@@ -193,7 +185,6 @@ class SectionMediaDeleteView(generics.DestroyAPIView):
 
 
 class SectionDeleteView(generics.DestroyAPIView):
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def delete(self, request, *args, **kwargs):
@@ -209,5 +200,4 @@ class SectionDeleteView(generics.DestroyAPIView):
 class SectionDialogView(generics.ListAPIView):
     queryset = Section.objects.filter(is_deleted=False)
     serializer_class = SectionDialogSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
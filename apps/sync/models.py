@@ -0,0 +1,64 @@
+from django.db import models
+from django.db.models.signals import post_delete, m2m_changed
+from django.dispatch import receiver
+from django.utils.timezone import now
+
+from apps.category.models import Category
+from apps.order.models import Discount
+from apps.printer.models import Printer
+from apps.product.models import Product
+from apps.section.models import Section
+from apps.table.models import Table
+
+
+# Models exposed through the change feed, keyed by their feed name.
+SYNC_MODELS = {
+    "product": Product,
+    "category": Category,
+    "section": Section,
+    "table": Table,
+    "discount": Discount,
+    "printer": Printer,
+}
+SYNC_MODEL_NAMES = {model: name for name, model in SYNC_MODELS.items()}
+
+
+class Tombstone(models.Model):
+    """Records a hard delete so clients syncing later can drop the row."""
+
+    model = models.CharField(max_length=50)
+    object_id = models.CharField(max_length=64)
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["model", "deleted_at"])]
+
+
+@receiver(post_delete, sender=Product)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Section)
+@receiver(post_delete, sender=Table)
+@receiver(post_delete, sender=Discount)
+@receiver(post_delete, sender=Printer)
+def tombstone_receiver(sender, instance, **kwargs):
+    Tombstone.objects.create(
+        model=SYNC_MODEL_NAMES[sender], object_id=str(instance.pk)
+    )
+
+
+@receiver(m2m_changed, sender=Product.category.through)
+def product_category_touch_receiver(sender, instance, action, reverse, pk_set, **kwargs):
+    # Category membership is part of the product row for clients, but m2m
+    # writes do not bump ``updated_at`` on their own.
+    if reverse:
+        if action == "pre_clear":
+            product_ids = instance.products.values("id")
+        elif action in ("post_add", "post_remove"):
+            product_ids = pk_set
+        else:
+            return
+    elif action in ("post_add", "post_remove", "post_clear"):
+        product_ids = [instance.pk]
+    else:
+        return
+    Product.objects.filter(pk__in=product_ids).update(updated_at=now())
@@ -0,0 +1,8 @@
+from django.urls import path
+from apps.sync.views import SyncChangesView
+
+
+app_name = "sync"
+urlpatterns = [
+    path("changes/", SyncChangesView.as_view(), name="sync-changes"),
+]
@@ -0,0 +1,129 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.utils.timezone import now
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework import status
+
+from apps.category.serializers import CategorySerializer
+from apps.order.serializers import DiscountSerializer
+from apps.printer.serializers import PrinterSerializer
+from apps.product.serializers import ProductSerializer
+from apps.section.serializers import SectionSerializer
+from apps.table.serializers import TableSerializer
+from apps.sync.models import SYNC_MODELS, Tombstone
+
+
+SYNC_SERIALIZERS = {
+    "product": ProductSerializer,
+    "category": CategorySerializer,
+    "section": SectionSerializer,
+    "table": TableSerializer,
+    "discount": DiscountSerializer,
+    "printer": PrinterSerializer,
+}
+SYNC_PREFETCH = {
+    "product": ["product_images"],
+    "section": ["gallery"],
+}
+
+
+def encode_sync_token(moment):
+    return str(int(moment.timestamp() * 1_000_000))
+
+
+def decode_sync_token(token):
+    try:
+        return datetime.fromtimestamp(int(token) / 1_000_000, tz=dt_timezone.utc)
+    except (TypeError, ValueError, OverflowError, OSError):
+        return None
+
+
+class SyncChangesView(APIView):
+    """
+    Change feed for offline-capable clients.
+
+    Without ``since`` (or with a token older than the tombstone retention)
+    every live row is returned and ``full`` is true. Otherwise only rows
+    updated since the token are returned, and rows removed since then are
+    listed under ``deleted``. Clients store the returned ``token`` for the
+    next call and upsert rows by id, as a short overlap window may repeat
+    rows already seen.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        names = request.query_params.get("models")
+        names = (
+            [name.strip() for name in names.split(",") if name.strip()]
+            if names
+            else list(SYNC_MODELS)
+        )
+        unknown = [name for name in names if name not in SYNC_MODELS]
+        if unknown:
+            return Response(
+                {"detail": _("Unknown sync models: %s") % ", ".join(unknown)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        token_time = now()
+        retention_start = token_time - timedelta(
+            days=settings.SYNC_TOMBSTONE_RETENTION_DAYS
+        )
+        since = None
+        since_token = request.query_params.get("since")
+        if since_token:
+            since = decode_sync_token(since_token)
+            if since is None:
+                return Response(
+                    {"detail": _("Invalid sync token.")},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+        full = since is None or since < retention_start
+        if not full:
+            since -= timedelta(seconds=settings.SYNC_OVERLAP_SECONDS)
+
+        changes = {}
+        deleted = {}
+        for name in names:
+            model = SYNC_MODELS[name]
+            soft_delete = any(f.name == "is_deleted" for f in model._meta.fields)
+            queryset = model.objects.select_related(
+                "created_by", "updated_by"
+            ).prefetch_related(*SYNC_PREFETCH.get(name, []))
+
+            if full:
+                if soft_delete:
+                    queryset = queryset.filter(is_deleted=False)
+                rows = list(queryset)
+                deleted[name] = []
+            else:
+                rows = list(queryset.filter(updated_at__gte=since))
+                deleted[name] = list(
+                    Tombstone.objects.filter(
+                        model=name, deleted_at__gte=since
+                    ).values_list("object_id", flat=True)
+                )
+                if soft_delete:
+                    deleted[name] += [str(row.pk) for row in rows if row.is_deleted]
+                    rows = [row for row in rows if not row.is_deleted]
+
+            changes[name] = SYNC_SERIALIZERS[name](
+                rows, many=True, context={"request": request}
+            ).data
+
+        Tombstone.objects.filter(deleted_at__lt=retention_start).delete()
+
+        return Response(
+            {
+                "token": encode_sync_token(token_time),
+                "full": full,
+                "changes": changes,
+                "deleted": deleted,
+            }
+        )
@@ -1,8 +1,12 @@
 from django.db import models
+from django.db.models.signals import post_save
+from django.dispatch import receiver
 from django.conf import settings
 import uuid
 from django.utils.translation import gettext_lazy as _
 
+from cafe.events import publish_event
+
 
 class Table(models.Model):
     HALL_CHOICES = [
@@ -19,6 +23,14 @@ class Table(models.Model):
         default=False
     )  # Indicates if the table is owned by owner
     is_active = models.BooleanField(default=True)
+    # Open order seated at this table, kept up to date by Order.save
+    current_order = models.ForeignKey(
+        "order.Order",
+        on_delete=models.SET_NULL,
+        related_name="+",
+        blank=True,
+        null=True,
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     created_by = models.ForeignKey(
@@ -35,3 +47,31 @@ class Table(models.Model):
         blank=True,
         null=True,
     )
+
+    class Meta:
+        indexes = [
+            # Occupied tables for the current order dialog. Django writes
+            # boolean filters as bare columns, which SQLite can only match
+            # against a partial index with the same condition.
+            models.Index(
+                fields=["table_number"],
+                condition=models.Q(is_active=True, is_occupied=True),
+                name="table_occupied_number_idx",
+            ),
+        ]
+
+
+def table_event_data(table):
+    return {
+        "id": table.pk,
+        "table_number": table.table_number,
+        "hall": table.hall,
+        "is_occupied": table.is_occupied,
+        "no_of_pax": table.no_of_pax,
+        "current_order": table.current_order_id,
+    }
+
+
+@receiver(post_save, sender=Table)
+def table_event_receiver(sender, instance, **kwargs):
+    publish_event("table.updated", table_event_data(instance))
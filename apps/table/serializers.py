@@ -49,11 +49,8 @@ class TableSerializer(serializers.ModelSerializer):
         return obj.updated_at.strftime("%Y-%m-%d")
 
     def get_current_order_id(self, obj):
-        if obj.is_occupied:
-            # Use the correct related_name 'tables'
-            current_order = obj.tables.filter(is_paid=False).first()
-            if current_order:
-                return current_order.id
+        if obj.is_occupied and obj.current_order_id:
+            return obj.current_order_id
         return "N/A"
 
 
@@ -71,11 +68,8 @@ class TableCurrentOrderDialogSerializer(serializers.ModelSerializer):
         fields = ["table_number", "current_order_id"]
 
     def get_current_order_id(self, obj):
-        if obj.is_occupied:
-            # Use the correct related_name 'tables'
-            current_order = obj.tables.filter(is_paid=False).first()
-            if current_order:
-                return current_order.id
+        if obj.is_occupied and obj.current_order_id:
+            return obj.current_order_id
         return "N/A"
 
 
@@ -15,7 +15,6 @@ from rest_framework import (
     generics,
     status,
 )
-from rest_framework_simplejwt.authentication import JWTAuthentication
 
 from apps.table.models import Table
 from apps.table.filters import TableFilter
@@ -32,7 +31,6 @@ from cafe.pagination import StandardResultsSetPagination
 
 class TableCreateView(generics.CreateAPIView):
     serializer_class = TableSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "table.add_table"
 
@@ -54,9 +52,12 @@ class TableCreateView(generics.CreateAPIView):
 
 
 class TableListView(generics.ListAPIView):
-    queryset = Table.objects.all().order_by("table_number")
+    queryset = (
+        Table.objects.all()
+        .select_related("created_by", "updated_by")
+        .order_by("table_number")
+    )
     serializer_class = TableSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "table.view_table"
     pagination_class = StandardResultsSetPagination
@@ -64,9 +65,12 @@ class TableListView(generics.ListAPIView):
     filterset_class=TableFilter
 
 class TableAvailableListView(generics.ListAPIView):
-    queryset = Table.objects.filter(is_occupied=False).order_by("table_number")
+    queryset = (
+        Table.objects.filter(is_occupied=False)
+        .select_related("created_by", "updated_by")
+        .order_by("table_number")
+    )
     serializer_class = TableSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "table.view_table"
     pagination_class = StandardResultsSetPagination
@@ -74,9 +78,12 @@ class TableAvailableListView(generics.ListAPIView):
     filterset_class=TableFilter
 
 class TableActiveListView(generics.ListAPIView):
-    queryset = Table.objects.filter(is_active=True).order_by("table_number")
+    queryset = (
+        Table.objects.filter(is_active=True)
+        .select_related("created_by", "updated_by")
+        .order_by("table_number")
+    )
     serializer_class = TableSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "table.view_table"
     pagination_class = StandardResultsSetPagination
@@ -84,9 +91,12 @@ class TableActiveListView(generics.ListAPIView):
     filterset_class=TableFilter
 
 class TableInActiveListView(generics.ListAPIView):
-    queryset = Table.objects.filter(is_active=False).order_by("table_number")
+    queryset = (
+        Table.objects.filter(is_active=False)
+        .select_related("created_by", "updated_by")
+        .order_by("table_number")
+    )
     serializer_class = TableSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "table.view_table"
     pagination_class = StandardResultsSetPagination
@@ -94,9 +104,12 @@ class TableInActiveListView(generics.ListAPIView):
     filterset_class=TableFilter
 
 class TableOccupiedListView(generics.ListAPIView):
-    queryset = Table.objects.filter(is_occupied=True).order_by("table_number")
+    queryset = (
+        Table.objects.filter(is_occupied=True)
+        .select_related("created_by", "updated_by")
+        .order_by("table_number")
+    )
     serializer_class = TableSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "table.view_table"
     pagination_class = StandardResultsSetPagination
@@ -105,7 +118,6 @@ class TableOccupiedListView(generics.ListAPIView):
 
 class TableRetrieveView(generics.RetrieveAPIView):
     serializer_class = TableSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "table.view_table"
     lookup_field = "id"
@@ -118,7 +130,6 @@ class TableRetrieveView(generics.RetrieveAPIView):
 
 class TableUpdateView(generics.UpdateAPIView):
     serializer_class = TableSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "table.change_table"
     lookup_field = "id"
@@ -145,7 +156,6 @@ class TableUpdateView(generics.UpdateAPIView):
 
 class TableChangeActiveView(generics.UpdateAPIView):
     serializer_class = TableActiveSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "table.change_table"
 
@@ -176,7 +186,6 @@ class TableChangeActiveView(generics.UpdateAPIView):
 
 class TableDeleteView(generics.DestroyAPIView):
     serializer_class = TableSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename = "table.delete_table"
 
@@ -193,7 +202,6 @@ class TableDeleteView(generics.DestroyAPIView):
 
 class TableCurrentOrderDialogView(generics.ListAPIView):
     serializer_class = TableCurrentOrderDialogSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
     queryset = Table.objects.filter(is_active=True, is_occupied=True).order_by(
         "table_number"
@@ -201,7 +209,6 @@ class TableCurrentOrderDialogView(generics.ListAPIView):
 
 
 class TableHallDialogView(APIView):
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request, *args, **kwargs):
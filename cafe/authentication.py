@@ -0,0 +1,80 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+
+AUTH_USER_CACHE_KEY = "auth_user:{id}"
+
+# The user fields kept in the cache; the password hash and personal details
+# are not, and load from the database if a view reads them
+AUTH_USER_CACHE_FIELDS = (
+    "id",
+    "email",
+    "name",
+    "name_ar",
+    "is_active",
+    "is_staff",
+    "is_superuser",
+)
+
+
+def invalidate_cached_user(user_id):
+    cache.delete(AUTH_USER_CACHE_KEY.format(id=user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that keeps the authenticated user's
+    ``AUTH_USER_CACHE_FIELDS`` in the cache for ``AUTH_USER_CACHE_TIMEOUT``
+    seconds instead of loading the row on every request. Tokens carrying
+    ``is_active: false`` are rejected without a lookup, and saving or
+    deleting a user drops its cached copy. That drop only reaches other
+    worker processes when the cache is shared (``CACHE_URL``); otherwise
+    they may use the old copy until it expires.
+
+    Views that modify the requesting user set ``requires_fresh_user = True``
+    to always authenticate with a freshly loaded row.
+    """
+
+    view = None
+
+    def get_user(self, validated_token):
+        if validated_token.get("is_active") is False:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if getattr(self.view, "requires_fresh_user", False):
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            return super().get_user(validated_token)
+
+        key = AUTH_USER_CACHE_KEY.format(id=user_id)
+        values = cache.get(key)
+        if values is None:
+            user = super().get_user(validated_token)
+            values = {field: getattr(user, field) for field in AUTH_USER_CACHE_FIELDS}
+            cache.set(key, values, settings.AUTH_USER_CACHE_TIMEOUT)
+            return user
+
+        # Rebuild the user with the other fields deferred, as ``.only()`` does
+        User = get_user_model()
+        field_names = [
+            field.attname
+            for field in User._meta.concrete_fields
+            if field.attname in values
+        ]
+        return User.from_db(
+            DEFAULT_DB_ALIAS, field_names, [values[name] for name in field_names]
+        )
+
+    def authenticate(self, request):
+        self.view = (getattr(request, "parser_context", None) or {}).get("view")
+        return super().authenticate(request)
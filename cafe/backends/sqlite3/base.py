@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    SQLite backend that applies ``SQLITE_PRAGMAS`` to every new connection:
+    WAL so readers don't block the writer, a busy timeout so writers wait
+    for the lock instead of failing, and larger page/mmap caches.
+    """
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for pragma, value in settings.SQLITE_PRAGMAS.items():
+            conn.execute("PRAGMA %s = %s" % (pragma, value))
+        return conn
@@ -0,0 +1,82 @@
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def bulk_action(model, ids, action, done, skip=None):
+    """
+    Apply ``action`` to the rows of ``model`` listed in ``ids`` as one
+    set-based operation and return a per-id result.
+
+    ``action`` receives a queryset of the eligible rows and should run a
+    single ``update()``/``delete()`` on it. ``skip`` is an optional
+    ``(field, value, result)`` triple; rows whose ``field`` already equals
+    ``value`` are left alone and reported with ``result``. Ids that do not
+    exist are reported as ``not_found`` and everything else with ``done``.
+    The lookup and the action run in one transaction.
+    """
+    if not isinstance(ids, (list, tuple)):
+        ids = [ids] if ids else []
+
+    results = {}
+    pks = {}
+    for raw_id in ids:
+        try:
+            pks[str(raw_id)] = str(model._meta.pk.to_python(raw_id))
+        except ValidationError:
+            results[str(raw_id)] = "not_found"
+
+    with transaction.atomic():
+        rows = model.objects.filter(pk__in=set(pks.values()))
+        if skip:
+            field, value, skipped = skip
+            existing = {
+                str(pk): current == value
+                for pk, current in rows.values_list("pk", field)
+            }
+        else:
+            skipped = None
+            existing = {str(pk): False for pk in rows.values_list("pk", flat=True)}
+
+        targets = [pk for pk, is_skipped in existing.items() if not is_skipped]
+        if targets:
+            action(model.objects.filter(pk__in=targets))
+
+    for raw_id, pk in pks.items():
+        if pk not in existing:
+            results[raw_id] = "not_found"
+        elif existing[pk]:
+            results[raw_id] = skipped
+        else:
+            results[raw_id] = done
+
+    return [{"id": raw_id, "result": results[str(raw_id)]} for raw_id in ids], len(
+        targets
+    )
+
+
+def bulk_response(results, count, detail, success_status=status.HTTP_200_OK):
+    """
+    Response for a ``bulk_action``. When every id was changed it has
+    ``success_status`` (204 for the delete endpoints, as before they were
+    batched); when only some were it is 200 with the per-id results. It is
+    404 when none of the ids exist and 400 when all of them were skipped.
+    """
+    if count:
+        partial = len({result["result"] for result in results}) > 1
+        return Response(
+            {"detail": detail, "count": count, "results": results},
+            status=status.HTTP_200_OK if partial else success_status,
+        )
+    if all(result["result"] == "not_found" for result in results):
+        return Response(
+            {"detail": _("No matching records found."), "results": results},
+            status=status.HTTP_404_NOT_FOUND,
+        )
+    return Response(
+        {"detail": _("No records were changed."), "results": results},
+        status=status.HTTP_400_BAD_REQUEST,
+    )
@@ -1,5 +1,59 @@
+from django.conf import settings
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.db.models import Q
 from rest_framework.permissions import BasePermission
 
+
+PERMISSIONS_VERSION_KEY = "effective_permissions:version"
+PERMISSIONS_CACHE_KEY = "effective_permissions:{version}:{user}"
+
+
+def _permissions_version():
+    version = cache.get(PERMISSIONS_VERSION_KEY)
+    if version is None:
+        version = 1
+        cache.add(PERMISSIONS_VERSION_KEY, version, None)
+    return version
+
+
+def invalidate_effective_permissions():
+    """Drop every cached permission set; called when users, groups or permissions change."""
+    try:
+        cache.incr(PERMISSIONS_VERSION_KEY)
+    except ValueError:
+        cache.set(PERMISSIONS_VERSION_KEY, 2, None)
+
+
+def get_effective_permissions(user):
+    """
+    All permissions the user has directly or through a group, both as
+    ``app_label.codename`` and as the bare codename, loaded with one query
+    and cached until the permission version changes or
+    ``PERMISSIONS_CACHE_TIMEOUT`` passes. The version is only seen by other
+    worker processes when the cache is shared (``CACHE_URL``).
+    """
+    if hasattr(user, "_effective_permissions"):
+        return user._effective_permissions
+
+    key = PERMISSIONS_CACHE_KEY.format(version=_permissions_version(), user=user.pk)
+    permissions = cache.get(key)
+    if permissions is None:
+        permissions = set()
+        for app_label, codename in (
+            Permission.objects.filter(Q(user=user) | Q(group__user=user))
+            .values_list("content_type__app_label", "codename")
+            .distinct()
+        ):
+            permissions.add("%s.%s" % (app_label, codename))
+            permissions.add(codename)
+        permissions = frozenset(permissions)
+        cache.set(key, permissions, settings.PERMISSIONS_CACHE_TIMEOUT)
+
+    user._effective_permissions = permissions
+    return permissions
+
+
 class HasPermissionOrInGroupWithPermission(BasePermission):
     """
     Custom permission to check if the user has the required permission or
@@ -14,14 +68,12 @@ class HasPermissionOrInGroupWithPermission(BasePermission):
             # If no permission_codename is set on the view, deny permission
             return False
 
-        # 1. Check if the user has the permission directly
-        if request.user.has_perm(permission_codename):
-            return True
+        if not request.user.is_active:
+            return False
 
-        # 2. Check if the user belongs to a group with the required permission
-        for group in request.user.groups.all():
-            if group.permissions.filter(codename=permission_codename).exists():
-                return True
+        # Active superusers have every permission
+        if request.user.is_superuser:
+            return True
 
-        # If neither condition is met, deny permission
-        return False
+        # Permissions granted directly or through any of the user's groups
+        return permission_codename in get_effective_permissions(request.user)
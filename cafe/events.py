@@ -0,0 +1,213 @@
+import json
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils.module_loading import import_string
+
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+
+def resync_event(last_id):
+    """
+    Sent instead of events when a client's cursor is ahead of the backend,
+    e.g. after a restart or a cache flush: the client should reload its
+    state and continue from ``last_id``.
+    """
+    return {"id": last_id, "type": "resync", "data": {}, "time": time.time()}
+
+
+class InProcessEventBackend:
+    """
+    Keeps the latest events in memory and wakes waiting readers on publish.
+    Only readers in the same process see the events, so it suits a single
+    worker (e.g. the development server or one threaded/ASGI process).
+    """
+
+    def __init__(self):
+        self._events = deque(maxlen=settings.EVENTS_BUFFER_SIZE)
+        self._last_id = 0
+        self._condition = threading.Condition()
+
+    def publish(self, event):
+        with self._condition:
+            self._last_id += 1
+            self._events.append({"id": self._last_id, **event})
+            self._condition.notify_all()
+
+    def last_id(self):
+        return self._last_id
+
+    def read(self, after_id, timeout):
+        with self._condition:
+            if after_id > self._last_id:
+                return [resync_event(self._last_id)]
+            self._condition.wait_for(lambda: self._last_id > after_id, timeout)
+            return [event for event in self._events if event["id"] > after_id]
+
+
+class CacheEventBackend:
+    """
+    Shares events between worker processes through the Django cache, which
+    must then be a shared one such as Redis or Memcached. Readers poll the
+    cache every ``EVENTS_CACHE_POLL_INTERVAL`` seconds.
+    """
+
+    last_id_key = "events:last_id"
+    event_key = "events:{id}"
+
+    def publish(self, event):
+        cache.add(self.last_id_key, 0, None)
+        event_id = cache.incr(self.last_id_key)
+        cache.set(
+            self.event_key.format(id=event_id),
+            {"id": event_id, **event},
+            settings.EVENTS_CACHE_TIMEOUT,
+        )
+
+    def last_id(self):
+        return cache.get(self.last_id_key, 0)
+
+    def read(self, after_id, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            last_id = self.last_id()
+            if after_id > last_id:
+                return [resync_event(last_id)]
+            if last_id > after_id:
+                first_id = max(after_id + 1, last_id - settings.EVENTS_BUFFER_SIZE + 1)
+                keys = [
+                    self.event_key.format(id=event_id)
+                    for event_id in range(first_id, last_id + 1)
+                ]
+                found = cache.get_many(keys)
+                return [found[key] for key in keys if key in found]
+            if time.monotonic() >= deadline:
+                return []
+            time.sleep(settings.EVENTS_CACHE_POLL_INTERVAL)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_event_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = import_string(settings.EVENTS_BACKEND)()
+    return _backend
+
+
+def publish_event(event_type, data):
+    """
+    Publish an event to stream listeners once the current transaction
+    commits. ``data`` may be a callable; it is then evaluated at commit time,
+    so the event carries the committed state (e.g. the bumped
+    ``Order.version``).
+    """
+
+    def publish():
+        payload = data() if callable(data) else data
+        event = {"type": event_type, "data": payload, "time": time.time()}
+        get_event_backend().publish(event)
+
+    transaction.on_commit(publish)
+
+
+class EventStreamRenderer(BaseRenderer):
+    media_type = "text/event-stream"
+    format = "event-stream"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data, cls=DjangoJSONEncoder)
+
+
+_stream_slots = None
+_stream_slots_lock = threading.Lock()
+
+
+def _get_stream_slots():
+    global _stream_slots
+    if _stream_slots is None:
+        with _stream_slots_lock:
+            if _stream_slots is None:
+                _stream_slots = threading.BoundedSemaphore(settings.EVENTS_MAX_STREAMS)
+    return _stream_slots
+
+
+class EventStreamView(APIView):
+    """
+    Floor events (tables, orders, printing) pushed to clients.
+
+    By default the request long-polls: it waits up to
+    ``EVENTS_LONG_POLL_TIMEOUT`` seconds for events after ``?after=<id>``
+    and returns them as JSON with the ``last_id`` to send next time.
+    ``?mode=stream`` returns a ``text/event-stream`` kept open for
+    ``EVENTS_STREAM_MAX_AGE`` seconds instead; clients reconnect and resume
+    with the ``Last-Event-ID`` header. A stream holds a worker for its whole
+    life, so at most ``EVENTS_MAX_STREAMS`` run per process (none by
+    default); beyond that the stream sends an ``unavailable`` event and
+    closes, and the client should fall back to long-polling.
+    """
+
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [JSONRenderer, EventStreamRenderer]
+
+    def get_after_id(self, request, backend):
+        after = request.META.get("HTTP_LAST_EVENT_ID") or request.query_params.get(
+            "after"
+        )
+        try:
+            return int(after)
+        except (TypeError, ValueError):
+            return backend.last_id()
+
+    def get(self, request, *args, **kwargs):
+        backend = get_event_backend()
+        after_id = self.get_after_id(request, backend)
+
+        if request.query_params.get("mode") != "stream":
+            events = backend.read(after_id, settings.EVENTS_LONG_POLL_TIMEOUT)
+            last_id = events[-1]["id"] if events else after_id
+            return Response({"last_id": last_id, "events": events})
+
+        response = StreamingHttpResponse(
+            self.stream(backend, after_id), content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    def stream(self, backend, after_id):
+        yield "retry: %d\n\n" % (settings.EVENTS_RETRY_MS)
+        slots = _get_stream_slots()
+        if not slots.acquire(blocking=False):
+            yield "event: unavailable\ndata: %s\n\n" % json.dumps({"mode": "poll"})
+            return
+        try:
+            deadline = time.monotonic() + settings.EVENTS_STREAM_MAX_AGE
+            while time.monotonic() < deadline:
+                events = backend.read(after_id, settings.EVENTS_HEARTBEAT_INTERVAL)
+                if not events:
+                    yield ": keep-alive\n\n"
+                    continue
+                for event in events:
+                    after_id = event["id"]
+                    yield "id: %d\nevent: %s\ndata: %s\n\n" % (
+                        event["id"],
+                        event["type"],
+                        json.dumps(event["data"], cls=DjangoJSONEncoder),
+                    )
+        finally:
+            slots.release()
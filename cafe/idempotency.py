@@ -0,0 +1,100 @@
+import hashlib
+import json
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework import status
+from rest_framework.response import Response
+
+
+IDEMPOTENCY_HEADER = "HTTP_IDEMPOTENCY_KEY"
+IDEMPOTENCY_CACHE_KEY = "idempotency:{scope}:{user}:{key}"
+IDEMPOTENCY_LOCK_KEY = "idempotency-lock:{scope}:{user}:{key}"
+
+
+def request_fingerprint(request):
+    payload = json.dumps(
+        [request.query_params, request.data], cls=DjangoJSONEncoder, sort_keys=True
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def idempotent(view_method):
+    """
+    Make a view handler safe to retry with an ``Idempotency-Key`` header.
+
+    The first successful response for a key is stored for
+    ``IDEMPOTENCY_KEY_TTL`` seconds and replayed (with an
+    ``Idempotent-Replayed`` header) for later requests with the same key,
+    without running the handler again. A request whose key is still being
+    processed gets 409, and reusing a key for a different request gets 422.
+    Failed requests are not stored, so they can be retried with the same key.
+    Requests without the header run as before.
+
+    Keys and locks live in the Django cache. With the default local-memory
+    cache each worker process has its own, so retries are only de-duplicated
+    when they reach the same process; deployments with several workers need
+    a shared cache such as Redis or Memcached.
+    """
+
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.META.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return view_method(self, request, *args, **kwargs)
+
+        key_parts = {
+            "scope": type(self).__name__,
+            "user": request.user.pk,
+            "key": hashlib.sha256(key.encode("utf-8")).hexdigest(),
+        }
+        cache_key = IDEMPOTENCY_CACHE_KEY.format(**key_parts)
+        lock_key = IDEMPOTENCY_LOCK_KEY.format(**key_parts)
+        fingerprint = request_fingerprint(request)
+
+        stored = cache.get(cache_key)
+        if stored is None:
+            if not cache.add(lock_key, fingerprint, settings.IDEMPOTENCY_LOCK_TIMEOUT):
+                return Response(
+                    {"detail": _("A request with this idempotency key is in progress.")},
+                    status=status.HTTP_409_CONFLICT,
+                )
+            try:
+                # The request holding the lock may have stored its response
+                # and released the lock between the read above and the add
+                stored = cache.get(cache_key)
+                if stored is None:
+                    response = view_method(self, request, *args, **kwargs)
+                    if status.is_success(response.status_code) and isinstance(
+                        response, Response
+                    ):
+                        stored = {
+                            "fingerprint": fingerprint,
+                            "status": response.status_code,
+                            "data": json.loads(
+                                json.dumps(response.data, cls=DjangoJSONEncoder)
+                            ),
+                        }
+                        cache.set(cache_key, stored, settings.IDEMPOTENCY_KEY_TTL)
+                    return response
+            finally:
+                cache.delete(lock_key)
+
+        if stored["fingerprint"] != fingerprint:
+            return Response(
+                {
+                    "detail": _(
+                        "This idempotency key was already used for a different request."
+                    )
+                },
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+        response = Response(stored["data"], status=stored["status"])
+        response["Idempotent-Replayed"] = "true"
+        return response
+
+    return wrapper
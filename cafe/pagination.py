@@ -1,5 +1,15 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import hashlib
+import json
+import math
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
 from django.utils.translation import gettext_lazy as _
 
 # class StandardResultsSetPagination(PageNumberPagination):
@@ -30,3 +40,157 @@ class StandardResultsSetPagination(PageNumberPagination):
                 "results": data,
             }
         )
+
+
+class KeysetResultsSetPagination(BasePagination):
+    """
+    Newest-first keyset pagination on (``created_at``, ``id``).
+
+    Pages are fetched with ``WHERE (created_at, id) < cursor`` instead of an
+    OFFSET, so deep pages cost the same as the first one. The response keeps
+    the ``StandardResultsSetPagination`` envelope with opaque ``cursor``
+    links; ``count`` and ``num_pages`` come from an exact COUNT, or from one
+    cached for ``count_cache_timeout`` seconds when that is set (see
+    ``CachedCountKeysetPagination``). Requests that pass ``page`` or
+    ``ordering`` fall back to page numbers.
+    """
+
+    page_size = 5
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+    cursor_query_param = "cursor"
+    fallback_query_params = ("page", "ordering")
+    count_cache_timeout = None
+    invalid_cursor_message = _("Invalid cursor")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.fallback = None
+        if any(param in request.query_params for param in self.fallback_query_params):
+            self.fallback = StandardResultsSetPagination()
+            self.fallback.page_size = self.page_size
+            return self.fallback.paginate_queryset(queryset, request, view)
+
+        self.page_size = self.get_page_size(request)
+        self.count = self.get_count(queryset)
+
+        cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor["reverse"])
+        if cursor:
+            created_at, pk = cursor["created_at"], cursor["id"]
+            if reverse:
+                queryset = queryset.filter(
+                    Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
+                )
+            else:
+                queryset = queryset.filter(
+                    Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+                )
+        ordering = ("created_at", "id") if reverse else ("-created_at", "-id")
+
+        results = list(queryset.order_by(*ordering)[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if reverse:
+            results.reverse()
+            self.has_previous, self.has_next = has_more, True
+        else:
+            self.has_previous, self.has_next = cursor is not None, has_more
+
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        if self.fallback is not None:
+            return self.fallback.get_paginated_response(data)
+        return Response(
+            {
+                "count": self.count,
+                "num_pages": math.ceil(self.count / self.page_size),
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(page_size, self.max_page_size) if page_size > 0 else self.page_size
+
+    def get_count(self, queryset):
+        if not self.count_cache_timeout:
+            return queryset.count()
+        sql, params = queryset.query.sql_with_params()
+        key = "pagination_count:%s" % hashlib.md5(
+            repr((sql, params)).encode("utf-8")
+        ).hexdigest()
+        count = cache.get(key)
+        if count is None:
+            count = queryset.count()
+            cache.set(key, count, self.count_cache_timeout)
+        return count
+
+    def get_next_link(self):
+        if self.fallback is not None:
+            return self.fallback.get_next_link()
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if self.fallback is not None:
+            return self.fallback.get_previous_link()
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(
+                self.request.build_absolute_uri(), self.cursor_query_param
+            )
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def encode_cursor(self, item, reverse):
+        if isinstance(item, dict):
+            created_at, pk = item["created_at"], item["id"]
+        else:
+            created_at, pk = item.created_at, item.pk
+        position = {
+            "c": created_at.isoformat(),
+            "i": pk if isinstance(pk, int) else str(pk),
+            "r": reverse,
+        }
+        token = base64.urlsafe_b64encode(
+            json.dumps(position, separators=(",", ":")).encode("utf-8")
+        ).decode("ascii")
+        return replace_query_param(
+            self.request.build_absolute_uri(), self.cursor_query_param, token
+        )
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+            created_at = parse_datetime(position["c"])
+            if created_at is None:
+                raise ValueError
+            return {
+                "created_at": created_at,
+                "id": position["i"],
+                "reverse": bool(position["r"]),
+            }
+        except (TypeError, ValueError, KeyError, UnicodeEncodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+
+class CachedCountKeysetPagination(KeysetResultsSetPagination):
+    """
+    ``KeysetResultsSetPagination`` whose ``count`` is cached for a minute,
+    for large lists where a slightly stale total is acceptable. The count is
+    not invalidated on writes.
+    """
+
+    count_cache_timeout = 60
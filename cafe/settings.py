@@ -4,6 +4,7 @@ from datetime import datetime, timedelta
 from django.conf import settings
 from django.utils.translation import gettext_lazy as _
 import environ
+from decimal import Decimal, ROUND_HALF_UP
 
 env = environ.Env()
 environ.Env.read_env()
@@ -48,6 +49,7 @@ INSTALLED_APPS = [
     "apps.table",
     "apps.order",
     "apps.printer",
+    "apps.sync",
 
 ]
 
@@ -115,9 +117,7 @@ REST_FRAMEWORK = {
         # "cafe.custom_permissions.CustomerPermission",
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework.authentication.SessionAuthentication",
-        "rest_framework.authentication.BasicAuthentication",
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "cafe.authentication.CachedJWTAuthentication",
     ),
 }
 SIMPLE_JWT = {
@@ -198,22 +198,55 @@ PAYPAL_BASE_URL=env('PAYPAL_BASE_URL')
 # Database
 # https://docs.djangoproject.com/en/4.1/ref/settings/#databases
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+# DB_ENGINE=postgres selects PostgreSQL (needed for more than one app
+# worker); anything else keeps the SQLite file used for development.
+DB_ENGINE = env("DB_ENGINE", default="sqlite")
+
+if DB_ENGINE == "postgres":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": env("DB_NAME"),
+            "USER": env("DB_USER"),
+            "PASSWORD": env("DB_PASSWORD"),
+            "HOST": env("DB_HOST", default="localhost"),
+            "PORT": env("DB_PORT", default="5432"),
+            # Keep connections open between requests and check them before reuse
+            "CONN_MAX_AGE": env.int("DB_CONN_MAX_AGE", default=600),
+            "CONN_HEALTH_CHECKS": True,
+            # Set DB_PGBOUNCER when connecting through pgbouncer in transaction
+            # pooling mode, which cannot keep server-side cursors open
+            "DISABLE_SERVER_SIDE_CURSORS": env.bool("DB_PGBOUNCER", default=False),
+            "OPTIONS": {
+                "connect_timeout": env.int("DB_CONNECT_TIMEOUT", default=5),
+            },
+        }
     }
+else:
+    DATABASES = {
+        "default": {
+            # Applies SQLITE_PRAGMAS below on connect
+            "ENGINE": "cafe.backends.sqlite3",
+            "NAME": BASE_DIR / "db.sqlite3",
+            "OPTIONS": {"timeout": 5},
+        }
+    }
+
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,
+    "cache_size": -20000,  # in KiB
+    "mmap_size": 256 * 1024 * 1024,
+    "temp_store": "MEMORY",
 }
-# DATABASES = {
-#     "default": {
-#         "ENGINE": "django.db.backends.postgresql_psycopg2",
-#         "NAME": env("DB_NAME"),
-#         "USER": env("DB_USER"),
-#         "PASSWORD": env("DB_PASSWORD"),
-#         "HOST": env("DB_HOST"),
-#         "PORT": env("DB_PORT"),
-#     }
-# }
+
+# Cached permissions, users, the open business day, the printer registry,
+# idempotency keys and the cache event backend all live here. The default
+# local-memory cache belongs to one process, so its invalidations never
+# reach other workers: run several workers only with a shared cache, e.g.
+# CACHE_URL=redis://127.0.0.1:6379/1 (needs the redis package).
+CACHES = {"default": env.cache_url("CACHE_URL", default="locmemcache://")}
 
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
@@ -289,4 +322,73 @@ CORS_ALLOW_ALL_ORIGINS: True
 
 CORS_ALLOW_CREDENTIALS: True
 CORS_ALLOW_METHODS = ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"]
-CORS_ALLOW_HEADERS = ["Content-Type", "Authorization"]
+CORS_ALLOW_HEADERS = ["Content-Type", "Authorization", "Idempotency-Key"]
+
+# Delta sync: how long delete tombstones are kept (older since-tokens get a
+# full resync) and how far back each delta reaches to cover in-flight writes.
+SYNC_TOMBSTONE_RETENTION_DAYS = 30
+SYNC_OVERLAP_SECONDS = 5
+
+# Restart KOT numbering at 1 for every business day instead of one
+# ever-increasing series.
+KOT_NUMBER_PER_BUSINESS_DAY = env.bool("KOT_NUMBER_PER_BUSINESS_DAY", default=False)
+
+# Order edits run under a row lock; lock timeouts and deadlocks are retried
+# this many times, waiting ORDER_MUTATION_RETRY_DELAY seconds more each time.
+ORDER_MUTATION_RETRIES = 3
+ORDER_MUTATION_RETRY_DELAY = 0.05
+
+# Order pricing: prices are VAT inclusive; amounts are rounded to
+# ORDER_AMOUNT_DECIMAL_PLACES using ORDER_AMOUNT_ROUNDING.
+ORDER_VAT_RATE = env("ORDER_VAT_RATE", cast=Decimal, default=Decimal("0.05"))
+ORDER_AMOUNT_DECIMAL_PLACES = 2
+ORDER_AMOUNT_ROUNDING = ROUND_HALF_UP
+
+# Floor event stream (api/events/). The in-process backend only reaches
+# clients served by the same process; with several workers use
+# "cafe.events.CacheEventBackend" together with a shared cache.
+EVENTS_BACKEND = env("EVENTS_BACKEND", default="cafe.events.InProcessEventBackend")
+EVENTS_BUFFER_SIZE = 500
+EVENTS_CACHE_TIMEOUT = 60 * 10
+EVENTS_CACHE_POLL_INTERVAL = 0.5
+EVENTS_LONG_POLL_TIMEOUT = 25
+EVENTS_HEARTBEAT_INTERVAL = 15
+EVENTS_STREAM_MAX_AGE = 60 * 5
+EVENTS_RETRY_MS = 3000
+# Concurrent ?mode=stream connections per process. Each one holds a worker
+# thread for EVENTS_STREAM_MAX_AGE, so streaming is off by default and
+# should only be enabled under an ASGI or gevent server; clients otherwise
+# long-poll.
+EVENTS_MAX_STREAMS = env.int("EVENTS_MAX_STREAMS", default=0)
+
+# Idempotency-Key handling for payment endpoints: how long a successful
+# response is replayed, and how long a key stays locked while in progress.
+# The lock must outlive the slowest request, including bill PDFs and
+# printing, or a retry could run the payment a second time. Keys are only
+# shared between workers when the cache is.
+IDEMPOTENCY_KEY_TTL = 60 * 60 * 24
+IDEMPOTENCY_LOCK_TIMEOUT = env.int("IDEMPOTENCY_LOCK_TIMEOUT", default=60 * 5)
+
+# Seconds a user's resolved permission set stays cached; any change to user
+# groups, group permissions or user permissions invalidates it earlier. The
+# invalidation only reaches other workers through a shared CACHE_URL, so
+# without one this is how long they may keep using revoked permissions.
+PERMISSIONS_CACHE_TIMEOUT = env.int("PERMISSIONS_CACHE_TIMEOUT", default=60)
+
+# Seconds CachedJWTAuthentication reuses a cached user instead of loading it
+# from the database; saving or deleting the user drops it earlier, in every
+# worker only with a shared CACHE_URL. Kept short so that without one a
+# deactivated user is locked out of other workers quickly.
+AUTH_USER_CACHE_TIMEOUT = env.int("AUTH_USER_CACHE_TIMEOUT", default=15)
+
+# Seconds the open business day stays in the shared cache (starting or
+# closing a day clears it earlier, in every worker only with a shared
+# CACHE_URL), and seconds each process reuses it before checking that cache
+# again. Without a shared CACHE_URL, payment paths confirm the day is still
+# open.
+BUSINESS_DAY_CACHE_TIMEOUT = 60
+BUSINESS_DAY_LOCAL_TIMEOUT = 5
+
+# Seconds each process keeps its printer registry before reloading it, so
+# printer changes reach every worker even without a shared CACHE_URL.
+PRINTER_REGISTRY_TIMEOUT = 60
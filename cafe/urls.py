@@ -4,6 +4,7 @@ from django.conf.urls.static import static
 from django.conf import settings
 from django.conf.urls.i18n import i18n_patterns
 from cafe.util import CheckFieldValueExistenceView
+from cafe.events import EventStreamView
 
 urlpatterns = [
     path("i18n/", include("django.conf.urls.i18n")),
@@ -30,6 +31,8 @@ urlpatterns += i18n_patterns(
     path("api/table/", include("apps.table.urls")),
     path("api/order/", include("apps.order.urls")),
     path("api/printer/", include("apps.printer.urls")),
+    path("api/sync/", include("apps.sync.urls")),
+    path("api/events/", EventStreamView.as_view(), name="event-stream"),
 )
 
 if settings.DEBUG:
@@ -164,8 +164,12 @@ def print_bill_escpos(
     vat,
     printer_ip,
     logo_path=None,
+    order_items=None,
 ):
-    """Prints the bill efficiently using escpos without logging or simulation."""
+    """
+    Prints the bill efficiently using escpos without logging or simulation.
+    ``order_items`` defaults to the order's unpaid items.
+    """
 
     arabic_font_path = os.path.join(os.getcwd(), "fonts", "Amiri-Regular.ttf")
     from apps.order.models import Payment
@@ -244,13 +248,14 @@ def print_bill_escpos(
         print_text("-" * width)
 
         # Order Items Processing
-        order_items = order.order_items.filter(remaining_quantity__gt=0)
+        if order_items is None:
+            order_items = order.order_items.filter(remaining_quantity__gt=0)
         for item_data in order_items:
             try:
-                product_name = item_data.product.name or "N/A"
-                product_name_ar = item_data.product.name_ar or "N/A"
+                product_name = item_data.product_name or "N/A"
+                product_name_ar = item_data.product_name_ar or "N/A"
                 quantity = item_data.remaining_quantity or 0
-                price = item_data.product.price or 0.00
+                price = item_data.unit_price or 0.00
                 total = quantity * price
 
                 # Wrap English text efficiently
@@ -410,10 +415,10 @@ def print_split_bill_escpos(
         # Order Items (only selected ones)
         for item_data in selected_items:
             try:
-                product_name = item_data["product"].name
-                product_name_ar = item_data["product"].name_ar
+                product_name = item_data["order_item"].product_name
+                product_name_ar = item_data["order_item"].product_name_ar
                 quantity = item_data["quantity"]
-                price = item_data["product"].price
+                price = item_data["order_item"].unit_price
                 total = quantity * price
 
                 # Wrap English text efficiently
@@ -585,13 +590,13 @@ def print_group_bill_escpos(
                     order=order, remaining_quantity__gt=0
                 )
                 for item in order_items:
-                    product_name = item.product.name
+                    product_name = item.product_name
                     product_name_ar = (
-                        item.product.name_ar.strip() if item.product.name_ar else ""
+                        item.product_name_ar.strip() if item.product_name_ar else ""
                     )
 
                     quantity = item.remaining_quantity
-                    price = item.product.price
+                    price = item.unit_price
                     total = quantity * price
 
                     # Store items by their English name as key
@@ -670,7 +675,10 @@ def print_group_bill_escpos(
         print(f"[ERROR] Printer connection failed: {e}")
 
 
-def format_bill(order, payment, total_payment_amount, vat, save_as_pdf=False):
+def format_bill(
+    order, payment, total_payment_amount, vat, save_as_pdf=False, order_items=None
+):
+    """``order_items`` defaults to the order's unpaid items."""
     from apps.order.models import Payment  # Replace with actual import
 
     bill_text = []
@@ -742,11 +750,13 @@ def format_bill(order, payment, total_payment_amount, vat, save_as_pdf=False):
     bill_text.append("-" * width)
 
     # Order Items (Properly formatted)
-    for item_data in order.order_items.filter(remaining_quantity__gt=0):
-        product_name = item_data.product.name
-        product_name_ar = item_data.product.name_ar
+    if order_items is None:
+        order_items = order.order_items.filter(remaining_quantity__gt=0)
+    for item_data in order_items:
+        product_name = item_data.product_name
+        product_name_ar = item_data.product_name_ar
         quantity = item_data.remaining_quantity
-        price = item_data.product.price
+        price = item_data.unit_price
         total = quantity * price
 
         # Wrap product names
@@ -895,10 +905,10 @@ def split_format_bill(
 
     # Order Items (only selected ones)
     for item_data in selected_items:
-        product_name = item_data["product"].name
-        product_name_ar = item_data["product"].name_ar
+        product_name = item_data["order_item"].product_name
+        product_name_ar = item_data["order_item"].product_name_ar
         quantity = item_data["quantity"]
-        price = item_data["product"].price
+        price = item_data["order_item"].unit_price
         total = quantity * price
 
         # Wrap product names
@@ -1030,10 +1040,10 @@ def group_format_bill(orders, payment, total_payment_amount, vat, save_as_pdf=Fa
     for order in orders:
         order_items = OrderItems.objects.filter(order=order, remaining_quantity__gt=0)
         for item in order_items:
-            product_name = item.product.name
-            product_name_ar = item.product.name_ar
+            product_name = item.product_name
+            product_name_ar = item.product_name_ar
             quantity = item.remaining_quantity
-            price = item.product.price
+            price = item.unit_price
             total = quantity * price
 
             if product_name in item_totals:
@@ -1270,7 +1280,8 @@ def generate_report(source):
     Generate a detailed report based on business day or date.
     """
     from apps.order.models import Order, Payment, BusinessDay, OrderItems
-    from apps.category.models import Category
+    from apps.category.models import Category, CategoryClosure
+    from apps.order.pricing import net_of_vat
     from decimal import Decimal
 
     if isinstance(source, BusinessDay):  # Z Report case
@@ -1322,12 +1333,12 @@ def generate_report(source):
 
     for order in orders:
         for item in order.order_items.filter(cancelled_quantity__gt=0):
-            product_name = item.product.name
+            product_name = item.product_name
             if product_name not in canceled_items:
                 canceled_items[product_name] = {"quantity": 0, "total_loss": Decimal(0)}
             canceled_items[product_name]["quantity"] += item.cancelled_quantity
             canceled_items[product_name]["total_loss"] += (
-                item.product.price * item.cancelled_quantity
+                item.unit_price * item.cancelled_quantity
             )
 
     # Shift Wise Guest Count & Sales
@@ -1369,17 +1380,17 @@ def generate_report(source):
             for category in item.product.category.filter(
                 parent__isnull=False
             ):  # Only subcategories
-                sub_group_sales[category.name] += (
-                    item.product.price * item.quantity
-                ) / Decimal(
-                    1.05
+                sub_group_sales[category.name] += net_of_vat(
+                    item.unit_price * item.quantity
                 )  # Price before VAT
 
     # Group Wise Sales
     categories = Category.objects.filter(parent__isnull=True)
-    category_map = {
-        sub.name: sub.parent.name for sub in sub_categories
-    }  # Parent category mapping
+    category_map = dict(
+        CategoryClosure.objects.filter(ancestor__parent__isnull=True).values_list(
+            "descendant__name", "ancestor__name"
+        )
+    )  # Top level category of every category, from the closure table
     group_sales = {cat.name: 0 for cat in categories}
 
     for order in orders:
@@ -1388,9 +1399,9 @@ def generate_report(source):
                 parent_name = category_map.get(
                     category.name, category.name
                 )  # Get parent or use itself
-                group_sales[parent_name] += (
-                    item.product.price * item.quantity
-                ) / Decimal(1.05)
+                group_sales[parent_name] += net_of_vat(
+                    item.unit_price * item.quantity
+                )
 
     # Discount Details
     discount_orders = [
@@ -1431,7 +1442,8 @@ def generate_report_for_period(business_days):
     from django.db.models import Sum
     from decimal import Decimal
     from apps.order.models import Order, Payment, OrderItems
-    from apps.category.models import Category
+    from apps.category.models import Category, CategoryClosure
+    from apps.order.pricing import net_of_vat
 
     if not business_days:
         return {"detail": "No business days found for this period."}
@@ -1492,12 +1504,12 @@ def generate_report_for_period(business_days):
 
     for order in orders:
         for item in order.order_items.filter(cancelled_quantity__gt=0):
-            product_name = item.product.name
+            product_name = item.product_name
             if product_name not in canceled_items:
                 canceled_items[product_name] = {"quantity": 0, "total_loss": Decimal(0)}
             canceled_items[product_name]["quantity"] += item.cancelled_quantity
             canceled_items[product_name]["total_loss"] += (
-                item.product.price * item.cancelled_quantity
+                item.unit_price * item.cancelled_quantity
             )
 
     # Shift Wise Guest Count & Sales
@@ -1539,17 +1551,17 @@ def generate_report_for_period(business_days):
             for category in item.product.category.filter(
                 parent__isnull=False
             ):  # Only subcategories
-                sub_group_sales[category.name] += (
-                    item.product.price * item.quantity
-                ) / Decimal(
-                    1.05
+                sub_group_sales[category.name] += net_of_vat(
+                    item.unit_price * item.quantity
                 )  # Price before VAT
 
     # Group Wise Sales
     categories = Category.objects.filter(parent__isnull=True)
-    category_map = {
-        sub.name: sub.parent.name for sub in sub_categories
-    }  # Parent category mapping
+    category_map = dict(
+        CategoryClosure.objects.filter(ancestor__parent__isnull=True).values_list(
+            "descendant__name", "ancestor__name"
+        )
+    )  # Top level category of every category, from the closure table
     group_sales = {cat.name: 0 for cat in categories}
 
     for order in orders:
@@ -1558,9 +1570,9 @@ def generate_report_for_period(business_days):
                 parent_name = category_map.get(
                     category.name, category.name
                 )  # Get parent or use itself
-                group_sales[parent_name] += (
-                    item.product.price * item.quantity
-                ) / Decimal(1.05)
+                group_sales[parent_name] += net_of_vat(
+                    item.unit_price * item.quantity
+                )
 
     # Discount Details
     discount_orders = [
@@ -1599,10 +1611,10 @@ def print_period_report(report_data, report_type, start_date, end_date):
     Print a formatted sales report for a given period based on multiple business days.
     """
     try:
-        from apps.printer.models import Printer
+        from apps.printer.registry import printer_registry
 
         # Get printer IP
-        p = Printer.objects.filter(printer_type="cashier").first()
+        p = printer_registry.printer("cashier")
         printer_ip = p.ip_address
         printer = Network(printer_ip)
 
@@ -1715,14 +1727,14 @@ def print_report(report_data, report_type):
     """
 
     try:
-        from apps.printer.models import Printer
+        from apps.printer.registry import printer_registry
 
         # from escpos.printer import Usb
         # vid=0x1504
         # pid=0x1F
         # printer =Usb(vid,pid)
         # Get printer IP
-        p = Printer.objects.filter(printer_type="cashier").first()
+        p = printer_registry.printer("cashier")
         printer_ip = p.ip_address
         printer = Network(printer_ip)
 
@@ -2324,7 +2336,7 @@ def print_sales_report(sales_report):
     Prints the sales report using the Rocket 300 thermal printer.
     The report is formatted for 80mm paper width.
     """
-    from apps.printer.models import Printer
+    from apps.printer.registry import printer_registry
 
     try:
         from escpos.printer import Usb
@@ -2333,7 +2345,7 @@ def print_sales_report(sales_report):
         # pid=0x1F
         # printer =Usb(vid,pid)
         # # Get cashier printer details
-        p = Printer.objects.filter(printer_type="cashier").first()
+        p = printer_registry.printer("cashier")
         if not p:
             raise ValueError("No cashier printer found.")
 
@@ -0,0 +1,163 @@
+"""
+Checkout throughput with several cashiers writing to one SQLite database.
+
+Each cashier is a thread that checks out its own orders through
+CheckoutOrderView, so every checkout takes the order lock in
+mutate_order, records the payment and renders the PDF bill like a real
+request. The run uses a throwaway database file and media directory, so
+the configured database is never touched.
+
+    python scripts/bench_checkout.py
+    python scripts/bench_checkout.py --cashiers 4 --orders 50
+    python scripts/bench_checkout.py --no-pragmas
+
+``--no-pragmas`` uses Django's stock SQLite backend instead of
+``cafe.backends.sqlite3``, for comparing against the default journal
+mode. The script needs the same environment as ``manage.py``.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from decimal import Decimal
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "cafe.settings")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cashiers", type=int, default=4)
+    parser.add_argument("--orders", type=int, default=50, help="orders per cashier")
+    parser.add_argument(
+        "--no-pragmas",
+        action="store_true",
+        help="use the stock SQLite backend without SQLITE_PRAGMAS",
+    )
+    return parser.parse_args()
+
+
+def configure(workdir, no_pragmas):
+    import django
+    from django.conf import settings
+
+    settings.DEBUG = False
+    settings.ALLOWED_HOSTS = ["*"]
+    settings.MEDIA_ROOT = str(workdir / "media")
+    logo_dir = BASE_DIR / "media" / "default_photos"
+    if logo_dir.exists():
+        shutil.copytree(logo_dir, workdir / "media" / "default_photos")
+
+    database = settings.DATABASES["default"]
+    if database["ENGINE"] not in ("cafe.backends.sqlite3", "django.db.backends.sqlite3"):
+        sys.exit("The checkout benchmark only runs against SQLite.")
+    database["NAME"] = str(workdir / "bench.sqlite3")
+    if no_pragmas:
+        database["ENGINE"] = "django.db.backends.sqlite3"
+        database["OPTIONS"] = {}
+    django.setup()
+
+
+def create_orders(cashiers, orders_per_cashier):
+    from django.core.management import call_command
+    from django.utils import timezone
+
+    from apps.order.models import BusinessDay, Order, OrderItems
+    from apps.product.models import Product
+    from apps.table.models import Table
+    from user.models import User
+
+    call_command("migrate", run_syncdb=True, verbosity=0)
+    BusinessDay.objects.create(start_time=timezone.now())
+    product = Product.objects.create(name="Tea", name_ar="شاي", price=Decimal("2.00"))
+
+    batches = []
+    for cashier in range(cashiers):
+        user = User.objects.create_user(
+            email=f"cashier{cashier}@cafe.test",
+            mobile_number=f"0100{cashier:07d}",
+            password="x",
+        )
+        order_ids = []
+        for number in range(orders_per_cashier):
+            table = Table.objects.create(
+                table_number=cashier * orders_per_cashier + number + 1
+            )
+            order = Order.objects.create(table=table, number_of_pax=2, created_by=user)
+            OrderItems.objects.create(order=order, product=product, quantity=2)
+            order_ids.append(order.pk)
+        batches.append((user, order_ids))
+    return batches
+
+
+def run_cashier(user, order_ids, results):
+    from django.db import OperationalError, connection
+    from rest_framework.test import APIRequestFactory, force_authenticate
+
+    from apps.order.views import CheckoutOrderView
+
+    view = CheckoutOrderView.as_view()
+    factory = APIRequestFactory()
+    try:
+        for order_id in order_ids:
+            request = factory.put(
+                f"/?order_id={order_id}", {"payment_method": "cash"}, format="json"
+            )
+            force_authenticate(request, user=user)
+            try:
+                response = view(request)
+            except OperationalError as e:
+                results[f"error: {e}"] += 1
+            else:
+                results[response.status_code] += 1
+    finally:
+        connection.close()
+
+
+def main():
+    args = parse_args()
+    workdir = Path(tempfile.mkdtemp(prefix="cafe-bench-"))
+    try:
+        configure(workdir, args.no_pragmas)
+        batches = create_orders(args.cashiers, args.orders)
+
+        from django.conf import settings
+        from django.db import connection
+
+        connection.close()
+        # One counter per cashier, so the threads never share one
+        counters = [Counter() for _ in batches]
+        threads = [
+            threading.Thread(target=run_cashier, args=(user, order_ids, counter))
+            for (user, order_ids), counter in zip(batches, counters)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        results = sum(counters, Counter())
+
+        total = args.cashiers * args.orders
+        checked_out = results[200]
+        print(f"backend:     {settings.DATABASES['default']['ENGINE']}")
+        print(f"cashiers:    {args.cashiers}")
+        print(f"checked out: {checked_out}/{total} in {elapsed:.2f}s")
+        print(f"throughput:  {checked_out / elapsed:.1f} checkouts/s")
+        for outcome, count in sorted(results.items(), key=str):
+            if outcome != 200:
+                print(f"  {outcome}: {count}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,7 @@ from django.db import models, IntegrityError
 from django.db.models import Q, UniqueConstraint
 from django.conf import settings
 from django.core.files.base import ContentFile
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete, m2m_changed
 from django.dispatch import receiver
 from django.contrib.auth.models import Group, Permission
 
@@ -210,3 +210,22 @@ class User(AbstractBaseUser, PermissionsMixin):
             return self.email
 
 
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+@receiver(m2m_changed, sender=Group.permissions.through)
+@receiver(post_delete, sender=Group)
+@receiver(post_delete, sender=Permission)
+def effective_permissions_invalidation_receiver(sender, **kwargs):
+    if kwargs.get("action", "post_").startswith("pre_"):
+        return
+    from cafe.custom_permissions import invalidate_effective_permissions
+
+    invalidate_effective_permissions()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def cached_user_invalidation_receiver(sender, instance, **kwargs):
+    from cafe.authentication import invalidate_cached_user
+
+    invalidate_cached_user(instance.pk)
@@ -23,7 +23,6 @@ from rest_framework.decorators import action
 from rest_framework.filters import SearchFilter, OrderingFilter
 from rest_framework.parsers import JSONParser
 
-from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.tokens import RefreshToken
 
 import uuid
@@ -56,7 +55,6 @@ from cafe.custom_permissions import HasPermissionOrInGroupWithPermission
 # User login view
 class LoginView(APIView):
     # Primary login view
-    authentication_classes = [JWTAuthentication]
 
     def post(self, request):
         identifier = request.data.get("identifier")  # Field for email or phone number
@@ -85,6 +83,8 @@ class LoginView(APIView):
             )
 
         refresh = RefreshToken.for_user(user)
+        access_token = refresh.access_token
+        access_token["is_active"] = user.is_active
         response = Response()
         # Extract group names and convert them to a list of strings
         group_names = list(user.groups.values_list("name", flat=True))
@@ -100,7 +100,7 @@ class LoginView(APIView):
             "user_permissions": user_permissions_names,
             "name": user.name,
             "is_staff": user.is_staff,
-            "access_token": str(refresh.access_token),
+            "access_token": str(access_token),
             # "refresh_token": str(refresh),
         }
         return response
@@ -108,7 +108,6 @@ class LoginView(APIView):
 
 class CreateUserView(generics.CreateAPIView):
     serializer_class = UserSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename='user.add_user'
 
@@ -133,7 +132,6 @@ class UserListView(generics.ListAPIView):
         is_deleted=False, is_superuser=False, is_staff=True
     ).order_by("-created_at")
     serializer_class = UserSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename='user.view_user'
 
@@ -154,7 +152,6 @@ class UserListView(generics.ListAPIView):
 class DeletedUserView(generics.ListAPIView):
     queryset = User.objects.filter(is_deleted=True).order_by("-created_at")
     serializer_class = UserSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename='user.view_user'
     pagination_class = StandardResultsSetPagination
@@ -173,7 +170,6 @@ class DeletedUserView(generics.ListAPIView):
 
 class UserRetrieveView(generics.RetrieveAPIView):
     serializer_class = UserSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename='user.view_user'
     lookup_field = "id"
@@ -189,9 +185,10 @@ class UserRetrieveView(generics.RetrieveAPIView):
 
 class UploadUserPhotoView(generics.UpdateAPIView):
     serializer_class = UserImageSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename='user.change_user'
+    # Saves request.user, so authenticate with a freshly loaded row
+    requires_fresh_user = True
 
     def initial(self, request, *args, **kwargs):
         super().initial(request, *args, **kwargs)
@@ -226,9 +223,10 @@ class UploadUserPhotoView(generics.UpdateAPIView):
 
 class UploadUserCoverView(generics.UpdateAPIView):
     serializer_class = UserCoverSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename='user.change_user'
+    # Saves request.user, so authenticate with a freshly loaded row
+    requires_fresh_user = True
 
     def initial(self, request, *args, **kwargs):
         super().initial(request, *args, **kwargs)
@@ -262,9 +260,10 @@ class UploadUserCoverView(generics.UpdateAPIView):
 
 class ManagerUserView(generics.RetrieveUpdateAPIView):
     serializer_class = UserSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename='user.change_user'
+    # Saves request.user, so authenticate with a freshly loaded row
+    requires_fresh_user = True
 
     def get_object(self):
         return self.request.user
@@ -284,7 +283,6 @@ class ManagerUserView(generics.RetrieveUpdateAPIView):
 
 class UserDeleteTemporaryView(generics.UpdateAPIView):
     serializer_class = UserDeleteSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename='user.change_user'
 
@@ -323,7 +321,6 @@ class UserDeleteTemporaryView(generics.UpdateAPIView):
 class UserRestoreView(generics.RetrieveUpdateAPIView):
 
     serializer_class = UserDeleteSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename='user.change_user'
 
@@ -357,7 +354,6 @@ class UserRestoreView(generics.RetrieveUpdateAPIView):
 
 class UserUpdateView(generics.RetrieveUpdateAPIView):
     serializer_class = UserSerializer
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename='user.change_user'
     lookup_field = "id"
@@ -380,7 +376,6 @@ class UserUpdateView(generics.RetrieveUpdateAPIView):
 
 
 class UserDeleteView(APIView):
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, HasPermissionOrInGroupWithPermission]
     permission_codename='user.delete_user'
 
@@ -420,12 +415,10 @@ class UserDeleteView(APIView):
 class UserDialogView(generics.ListAPIView):
     serializer_class = UserDialogSerializer
     queryset = User.objects.filter(is_deleted=False, is_superuser=False)
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
 
 
 class UserGenderDialogView(APIView):
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request, *args, **kwargs):